@@ -0,0 +1,68 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import subprocess
+import sys
+
+# The modules, which are imported by the processes running or evaluating simulations.
+WORKER_MODULES = ("sim.evaluator", "main", "batch")
+
+# The modules, which are slow to import and must only be imported on demand.
+LAZY_MODULES = ("matplotlib", "pymoo.factory", "eppy", "scipy.stats")
+
+
+def import_time(module: str, n_repeats=5) -> tuple:
+    """Return the shortest cumulative import time of a module in microseconds and the names of all modules it
+    imports, each measured in a fresh interpreter by python -X importtime."""
+
+    root = os.path.abspath("..")
+    environment = {**os.environ, "PYTHONPATH": root}
+
+    best, names = None, set()
+    for _ in range(n_repeats):
+        # NOTE - The modules of the opt package import their siblings directly, so they are imported from inside it.
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                                cwd=os.path.join(root, "opt"), env=environment, capture_output=True, text=True,
+                                check=True).stderr
+
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+
+            _, cumulative, name = line[len("import time:"):].split("|")
+            names.add(name.strip())
+            if name.strip() == module:
+                best = int(cumulative) if best is None else min(best, int(cumulative))
+
+    return best, names
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for benchmarking purposes."""
+
+        for module in WORKER_MODULES:
+            cumulative, names = import_time(module)
+
+            loaded = [lazy for lazy in LAZY_MODULES if lazy in names]
+            print("{:15} = {:7.1f} ms | EAGER HEAVY MODULES = {}".format(module, cumulative / 1E3,
+                                                                       ", ".join(loaded) or "NONE"))
+
+
+    main()
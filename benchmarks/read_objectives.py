@@ -0,0 +1,121 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import timeit
+
+import prefs.parameters
+
+import sim.modifier
+import sim.reader
+import sim.runner
+import utils.optimization
+
+
+def find_installation(ep_version=prefs.parameters.parameters["EPLUS_VERSION"]):
+    """Return the paths to the EnergyPlus™ and ReadVarsESO executables of an installation, or None if missing."""
+
+    import eppy.runner.run_functions
+
+    executable = eppy.runner.run_functions.install_paths(ep_version)[0]
+    read_vars = os.path.join(os.path.dirname(executable), "PostProcess",
+                             "ReadVarsESO.exe" if platform.system() == "Windows" else "ReadVarsESO")
+
+    if not os.path.isfile(executable) or not os.path.isfile(read_vars):
+        return None
+
+    return executable, read_vars
+
+
+def run_read_vars(run_directory: str, read_vars: str) -> None:
+    """Convert the eplusout.ESO and eplusout.MTR files of a simulation to .CSV files, like EnergyPlus™ does when it is
+    run with --readvars."""
+
+    # NOTE - These are the same input files EnergyPlus™ writes for ReadVarsESO.
+    for filename, source, destination in (("eplusout.rvi", "eplusout.eso", "eplusout.csv"),
+                                          ("eplusout.mvi", "eplusout.mtr", "eplusmtr.csv")):
+        with open(os.path.join(run_directory, filename), "w") as file:
+            file.write("{}\n{}\n".format(source, destination))
+
+        subprocess.run([read_vars, filename, "unlimited"], cwd=run_directory, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True)
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for benchmarking purposes."""
+
+        idf = "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf"
+        epw = "../database/sim/model/USA_AZ_Tucson-Davis-Monthan.AFB.722745_TMY3.epw"
+        idd = "../sim/EnergyPlus/EnergyPlus.idd"
+
+        # NOTE - Both backends are timed on the output of a real simulation, which requires an installation.
+        installation = find_installation()
+        if installation is None:
+            print("SKIPPED: No EnergyPlus™ {} installation with ReadVarsESO was found.".format(
+                prefs.parameters.parameters["EPLUS_VERSION"]))
+
+            return
+
+        executable, read_vars = installation
+
+        # The design in the middle of the design space.
+        x = utils.optimization.read_problem_bounds("../database/opt/model/variable_bounds.csv").mean(axis=0)
+
+        template = sim.modifier.ModelTemplate(idf, idd=idd, output_sqlite=True)
+
+        run_directory = tempfile.mkdtemp()
+        try:
+            scratch_idf = os.path.join(run_directory, "in.idf")
+            template.save(x, scratch_idf)
+
+            # The simulation writes the eplusout.ESO, eplustbl.HTM and eplusout.SQL files, which both backends read.
+            command = sim.runner.build_command(scratch_idf, epw, idd=idd, output_path=run_directory, read_vars=False,
+                                               executable=executable)
+            subprocess.run(command, cwd=run_directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           check=True)
+
+            # NOTE - The legacy post-processing of each evaluation runs ReadVarsESO before reading the eplusout.CSV and
+            #  eplustbl.HTM files.
+            def legacy():
+                run_read_vars(run_directory, read_vars)
+
+                return sim.reader.read_objectives(run_directory, backend="csv")
+
+            def current():
+                return sim.reader.read_objectives(run_directory, backend="sql")
+
+            legacy_objectives, objectives = legacy(), current()
+            # NOTE - The tabular reports are rounded, so the objectives are only compared to a relative tolerance.
+            assert all(abs(a - b) <= 1E-3 * abs(a) for a, b in zip(legacy_objectives, objectives))
+
+            n_repeats = 20
+            legacy_time = timeit.timeit(legacy, number=n_repeats) / n_repeats
+            time = timeit.timeit(current, number=n_repeats) / n_repeats
+        finally:
+            shutil.rmtree(run_directory, ignore_errors=True)
+
+        print("READVARSESO + CSV + HTML = {:8.2f} ms | SQL = {:7.2f} ms | SPEEDUP = {:5.1f}x".format(
+            legacy_time * 1E3, time * 1E3, legacy_time / time))
+
+
+    main()
@@ -0,0 +1,77 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import timeit
+import warnings
+
+import numpy
+
+import sim.reader
+
+
+def legacy_weigh_ppd(occ: numpy.ndarray, ppd: numpy.ndarray) -> list:
+    """Calculate the occupancy-weighted site PPD time series one timestep at a time, like older versions did."""
+
+    with numpy.errstate(divide='warn'):
+        warnings.filterwarnings('error', category=RuntimeWarning)
+
+        _ppd = []
+        for i in range(len(occ)):
+            try:
+                _ppd.append(sum(occ[i, :] * ppd[i, :]) / sum(occ[i, :]))
+            except RuntimeWarning:
+                _ppd.append(0)
+
+        warnings.filterwarnings('default')
+
+    return _ppd
+
+
+def synthesize_results(n_timesteps: int, n_zones=15, seed=0) -> tuple:
+    """Generate random occupant count and PPD time series, where the site is unoccupied at night."""
+
+    rng = numpy.random.default_rng(seed)
+
+    occ = rng.uniform(0, 50, (n_timesteps, n_zones))
+    occ[numpy.arange(n_timesteps) % 24 < 7] = 0
+    ppd = rng.uniform(5, 100, (n_timesteps, n_zones))
+
+    return occ, ppd
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for benchmarking purposes."""
+
+        # An annual run with hourly and 10-minute timesteps, respectively.
+        for n_timesteps in (8760, 52560):
+            occ, ppd = synthesize_results(n_timesteps)
+
+            site_ppd, occupied = sim.reader.weigh_ppd(occ, ppd)
+            assert numpy.allclose(site_ppd, legacy_weigh_ppd(occ, ppd))
+
+            n_repeats = 5
+            legacy_time = timeit.timeit(lambda: legacy_weigh_ppd(occ, ppd), number=n_repeats) / n_repeats
+            n_repeats = 100
+            time = timeit.timeit(lambda: sim.reader.weigh_ppd(occ, ppd), number=n_repeats) / n_repeats
+
+            print("TIMESTEPS = {:>6} | LOOP = {:9.3f} ms | VECTORIZED = {:7.3f} ms | SPEEDUP = {:7.1f}x".format(
+                n_timesteps, legacy_time * 1E3, time * 1E3, legacy_time / time))
+
+
+    main()
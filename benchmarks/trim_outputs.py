@@ -0,0 +1,87 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+import sim.modifier
+import sim.reader
+import sim.runner
+import utils.optimization
+
+
+def directory_size(path: str) -> int:
+    """Return the total size of the files inside a directory in bytes."""
+
+    return sum(os.path.getsize(os.path.join(path, filename)) for filename in os.listdir(path))
+
+
+def simulate(template: sim.modifier.ModelTemplate, x, epw: str, backend: str) -> tuple:
+    """Simulate a design in a temporary directory and return its wall time, output volume and objectives."""
+
+    run_directory = tempfile.mkdtemp()
+    try:
+        idf = os.path.join(run_directory, "in.idf")
+        template.save(x, idf)
+
+        command = sim.runner.build_command(idf, epw, idd=template.model.iddname, output_path=run_directory,
+                                           read_vars=backend == "csv")
+
+        start = time.perf_counter()
+        subprocess.run(command, cwd=run_directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        objectives = sim.reader.read_objectives(run_directory, backend=backend)
+        wall_time = time.perf_counter() - start
+
+        # NOTE - The model itself is not an output.
+        return wall_time, directory_size(run_directory) - os.path.getsize(idf), objectives
+    finally:
+        shutil.rmtree(run_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for benchmarking purposes."""
+
+        idf = "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf"
+        epw = "../database/sim/model/USA_AZ_Tucson-Davis-Monthan.AFB.722745_TMY3.epw"
+        idd = "../sim/EnergyPlus/EnergyPlus.idd"
+
+        backend = "sql"
+        n_repeats = 5
+
+        # The design in the middle of the design space.
+        x = utils.optimization.read_problem_bounds("../database/opt/model/variable_bounds.csv").mean(axis=0)
+
+        results = {}
+        for trim in (False, True):
+            template = sim.modifier.ModelTemplate(idf, idd=idd, output_sqlite=backend == "sql", trim=trim)
+
+            runs = [simulate(template, x, epw, backend) for _ in range(n_repeats)]
+
+            results[trim] = runs[0][2]
+            print("TRIMMED = {!s:>5} | WALL TIME = {:7.2f} s | OUTPUT VOLUME = {:8.2f} MB | OBJECTIVES = {}".format(
+                trim, min(run[0] for run in runs), runs[0][1] / 2 ** 20, runs[0][2]))
+
+        # Trimming the outputs must never change the objectives.
+        assert results[False] == results[True]
+
+
+    main()
@@ -47,21 +47,24 @@
 import numpy as np
 
 from pymoo.core.crossover import Crossover
-from pymoo.core.duplicate import ElementwiseDuplicateElimination
+from pymoo.core.duplicate import DuplicateElimination
 
 from pymoo.core.mutation import Mutation
+from pymoo.core.repair import Repair
 
 from pymoo.core.sampling import Sampling
 from pymoo.operators.repair.to_bound import set_to_bounds_if_outside_by_problem
 
 from prefs.parameters import parameters
 
+import utils.optimization
+
 
 class SamplingScheme(Sampling):
-    """Uniformly sample real floating-point numbers with a predefined number of decimal places by considering the
-    lower and upper bounds of the sim problem."""
+    """Sample real floating-point numbers with a predefined number of decimal places by considering the lower and upper
+    bounds of the sim problem."""
 
-    def __init__(self, decimals=parameters["SAMPLING_DECIMALS"]) -> None:
+    def __init__(self, decimals=parameters["SAMPLING_DECIMALS"], method=parameters["SAMPLING_METHOD"]) -> None:
         """
         ----------------
         Input Parameters
@@ -70,28 +73,42 @@ class SamplingScheme(Sampling):
         decimals: int
             The accuracy level, to which the initial population sampling process should be performed, measured by the
             number of decimal places to which the sampled real floating-point numbers should be rounded.
+
+        method: str
+            The sampling method, i.e. lhs for a Latin hypercube, sobol for a scrambled Sobol sequence, or uniform.
         """
 
         super().__init__()
 
         self.decimals = decimals
+        self.method = method
 
     def _do(self, problem, n_samples, **kwargs):
-        # TODO - Fix the method docstring.
-        """Uniformly sample real floating-point numbers with a predefined number of decimal places by considering the
-        lower and upper bounds of the sim problem."""
+        """Sample the whole initial population at once in the unit hypercube, scale it to the bounds of the sim problem
+        and round it to the predefined number of decimal places."""
+
+        # NOTE - SciPy's statistics package is slow to import, so it is only imported when it is needed.
+        import scipy.stats.qmc
 
         # Initialize NumPy's recommended RNG.
         rng = np.random.default_rng(seed=parameters["SEED"])
 
-        # Sample the initial population from a uniform distribution.
-        samples = rng.uniform(problem.xl, problem.xu, (n_samples, problem.n_var))
+        if self.method.lower() == "lhs":
+            samples = scipy.stats.qmc.LatinHypercube(problem.n_var, seed=rng).random(n_samples)
+        elif self.method.lower() == "sobol":
+            # NOTE - The balance properties of Sobol sequences only hold for powers of two, so the smallest such
+            #  sequence that covers the population is drawn and truncated.
+            m = int(np.ceil(np.log2(max(n_samples, 1))))
+            samples = scipy.stats.qmc.Sobol(problem.n_var, seed=rng).random_base2(m)[:n_samples]
+        elif self.method.lower() == "uniform":
+            samples = rng.uniform(size=(n_samples, problem.n_var))
+        else:
+            raise NameError("The sampling method must be set to either lhs, sobol, or uniform.")
 
-        # TODO - IMPLEMENT THIS LATER.
-        # # Round the samples to the predefined number of decimal places.
-        # samples = np.round(samples, self.decimals)
+        # NOTE - The samples span the closed upper bounds, so that rounding them down covers each grid point equally.
+        samples = problem.xl + samples * (problem.xu - problem.xl)
 
-        return samples
+        return utils.optimization.snap(samples, problem.xl, problem.xu, self.decimals)
 
 
 class CrossoverScheme(Crossover):
@@ -243,5 +260,60 @@ class MutationScheme(Mutation):
         return Y
 
 
-class DuplicateEliminationScheme(ElementwiseDuplicateElimination):
-    pass
\ No newline at end of file
+class RepairScheme(Repair):
+    """Round the offspring to the same decimal places and bounds as the initial population."""
+
+    def __init__(self, decimals=parameters["SAMPLING_DECIMALS"]) -> None:
+        super().__init__()
+
+        self.decimals = decimals
+
+    def _do(self, problem, pop, **kwargs):
+        pop.set("X", utils.optimization.snap(pop.get("X"), problem.xl, problem.xu, self.decimals))
+
+        return pop
+
+
+class DuplicateEliminationScheme(DuplicateElimination):
+    """Eliminate the designs which are equal when rounded to a predefined number of decimal places, by hashing them
+    instead of comparing them pairwise."""
+
+    def __init__(self, decimals=parameters["SAMPLING_DECIMALS"], design_archive=None) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        decimals: int
+            The number of decimal places, to which the designs are rounded before they are compared.
+
+        design_archive: archive.DesignArchive
+            The archive of every design evaluated so far, which is also considered a duplicate of the offspring. It is
+            filled by the convergence callback. If None, only the current populations are compared.
+        """
+
+        super().__init__()
+
+        self.decimals = decimals
+        self.design_archive = design_archive
+
+    def _do(self, pop, other, is_duplicate):
+        Q = np.ascontiguousarray(utils.optimization.quantize(pop.get("X"), self.decimals))
+
+        # NOTE - Each row is viewed as a single opaque element, so that whole design vectors are sorted and compared in
+        #  a single pass.
+        rows = Q.view(np.dtype((np.void, Q.dtype.itemsize * Q.shape[1]))).ravel()
+
+        if other is None:
+            # Only the first occurrence of each design survives.
+            _, first = np.unique(rows, return_index=True)
+            is_duplicate[:] = True
+            is_duplicate[first] = False
+
+            if self.design_archive is not None and len(self.design_archive):
+                is_duplicate |= self.design_archive.contains(pop.get("X"))
+        else:
+            R = np.ascontiguousarray(utils.optimization.quantize(other.get("X"), self.decimals))
+            is_duplicate |= np.isin(rows, R.view(rows.dtype).ravel())
+
+        return is_duplicate
\ No newline at end of file
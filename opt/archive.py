@@ -0,0 +1,191 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import bisect
+
+import numpy as np
+
+from prefs.parameters import parameters
+
+import utils.optimization
+
+
+class ParetoArchive:
+    """Keep every non-dominated solution of a bi-objective minimization problem evaluated so far, sorted by the first
+    objective."""
+
+    def __init__(self, reference_point=None) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        reference_point: tuple
+            The reference point of the hypervolume, which is maintained incrementally. If None, the hypervolume is not
+            maintained until a reference point is set.
+        """
+
+        # NOTE - Inside a set of mutually non-dominated solutions sorted by ascending first objective, the second
+        #  objective is strictly descending, so both dominance checks and insertions only need a binary search.
+        self.f1 = []
+        self.f2 = []
+        self.designs = []
+        self.fidelities = []
+
+        self.reference_point = None
+        self.hypervolume = None
+        if reference_point is not None:
+            self.set_reference_point(reference_point)
+
+    def __len__(self) -> int:
+        return len(self.f1)
+
+    # NOTE - The archive behaves like the array of its objectives, so that it can be passed directly to any function
+    #  expecting res.F.
+    def __array__(self, dtype=None, copy=None):
+        return self.F if dtype is None else self.F.astype(dtype)
+
+    def __getitem__(self, index):
+        return self.F[index]
+
+    @property
+    def F(self) -> np.ndarray:
+        """The objectives of the archived solutions, sorted by ascending first objective."""
+
+        return np.column_stack([self.f1, self.f2]) if self.f1 else np.empty((0, 2))
+
+    @property
+    def X(self) -> np.ndarray:
+        """The design vectors of the archived solutions, in the same order as their objectives."""
+
+        return np.array(self.designs)
+
+    @property
+    def fidelity(self) -> np.ndarray:
+        """The fidelity of the simulations, which produced the objectives of the archived solutions."""
+
+        return np.array(self.fidelities, dtype=object)
+
+    def set_reference_point(self, reference_point) -> None:
+        """Set the reference point of the hypervolume and calculate the latter from scratch."""
+
+        self.reference_point = (float(reference_point[0]), float(reference_point[1]))
+        self.hypervolume = self._contributions(0, len(self.f1))
+
+    def _contributions(self, start: int, stop: int) -> float:
+        """Return the area dominated exclusively by the archived solutions between two indices, in the form of the
+        rectangles extending from each solution to the next one along the first objective."""
+
+        r1, r2 = self.reference_point
+
+        area = 0.
+        for i in range(max(start, 0), min(stop, len(self.f1))):
+            right = self.f1[i + 1] if i + 1 < len(self.f1) else r1
+
+            # NOTE - Solutions outside the reference box do not contribute anything.
+            area += max(min(right, r1) - self.f1[i], 0.) * max(r2 - self.f2[i], 0.)
+
+        return area
+
+    def is_dominated(self, f) -> bool:
+        """Check whether a solution is dominated by, or equal to, any archived solution."""
+
+        # The archived solution with the lowest second objective among those whose first objective is not greater.
+        i = bisect.bisect_right(self.f1, f[0]) - 1
+
+        return i >= 0 and self.f2[i] <= f[1]
+
+    def insert(self, f, x=None, fidelity=None) -> bool:
+        """Insert a solution, unless it is dominated, removing every archived solution it dominates."""
+
+        if self.is_dominated(f):
+            return False
+
+        # The solutions dominated by the new one form a contiguous run starting at its insertion point.
+        start = bisect.bisect_left(self.f1, f[0])
+        stop = start
+        while stop < len(self.f2) and self.f2[stop] >= f[1]:
+            stop += 1
+
+        # NOTE - Only the rectangles of the removed solutions and their predecessor change, so the hypervolume is
+        #  updated locally instead of being recalculated.
+        if self.reference_point is not None:
+            self.hypervolume -= self._contributions(start - 1, stop)
+
+        self.f1[start:stop] = [float(f[0])]
+        self.f2[start:stop] = [float(f[1])]
+        self.designs[start:stop] = [None if x is None else np.array(x, dtype=float)]
+        self.fidelities[start:stop] = [fidelity]
+
+        if self.reference_point is not None:
+            self.hypervolume += self._contributions(start - 1, start + 1)
+
+        return True
+
+    def update(self, F, X=None, fidelities=None) -> int:
+        """Insert a set of solutions, one per row, and return the number of those which entered the archive."""
+
+        F = np.asarray(F, dtype=float)
+        if F.ndim != 2 or F.shape[1] != 2:
+            raise ValueError("The archive only supports bi-objective problems.")
+
+        if X is None:
+            X = [None] * len(F)
+        if fidelities is None:
+            fidelities = [None] * len(F)
+
+        return sum(self.insert(f, x, fidelity) for f, x, fidelity in zip(F, X, fidelities))
+
+    def igd_plus(self, reference_set) -> float:
+        """Calculate the inverted generational distance plus of the archived solutions with respect to a reference
+        set."""
+
+        # The modified distance of IGD+ only considers the objectives, in which a solution is worse than a reference
+        # point, which makes it weakly Pareto compliant.
+        difference = np.maximum(self.F[None, :, :] - np.asarray(reference_set, dtype=float)[:, None, :], 0.)
+
+        return float(np.mean(np.min(np.sqrt(np.sum(difference ** 2, axis=2)), axis=1)))
+
+
+def _hashes(X, decimals: int) -> list:
+    """Return a hashable key for each design vector, which is equal for vectors equal on the grid."""
+
+    Q = np.ascontiguousarray(utils.optimization.quantize(X, decimals))
+
+    return [row.tobytes() for row in Q]
+
+
+class DesignArchive:
+    """Keep a hash of every design evaluated so far, rounded to a predefined number of decimal places."""
+
+    def __init__(self, decimals=parameters["SAMPLING_DECIMALS"]) -> None:
+        self.decimals = decimals
+        self.hashes = set()
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def add(self, X) -> None:
+        """Add a set of designs, one per row."""
+
+        self.hashes.update(_hashes(X, self.decimals))
+
+    def contains(self, X) -> np.ndarray:
+        """Return whether each of a set of designs, one per row, has already been evaluated."""
+
+        return np.array([key in self.hashes for key in _hashes(X, self.decimals)], dtype=bool)
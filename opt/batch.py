@@ -0,0 +1,233 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import concurrent.futures
+import difflib
+import glob
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from pymoo.optimize import minimize
+
+import archive
+import checkpoint
+import indicators
+import log_writer
+from main import OptimizationProblem, build_algorithm
+import termination_criterion
+
+from prefs.parameters import parameters
+
+import sim.scheduler
+
+import utils.file_manager
+
+
+def _normalize(name: str) -> str:
+    return re.sub("[^a-z]", "", name.lower())
+
+
+def pair_models(model_directory="../database/sim/model/ASHRAE901_OfficeMedium_STD2019/",
+                weather_directory="../database/sim/model/ASHRAE901_epw/") -> dict:
+    """
+    Match each city model to the weather file of the same city and return the pairs by city name.
+
+    The city of an ASHRAE 90.1 prototype model is the last part of its file name, e.g. ElPaso, while the city of a TMY3
+    weather file follows its country and state codes, e.g. USA_TX_El.Paso.Intl.AP.722700_TMY3. NOTE - Some of the
+    weather files are misspelled, so the closest match is accepted. Models without any matching weather file are
+    skipped.
+    """
+
+    stations = {}
+    for epw in sorted(glob.glob(os.path.join(weather_directory, "*.epw"))):
+        stations[_normalize(os.path.basename(epw).split("_", 2)[-1])] = epw
+
+    pairs = {}
+    for idf in sorted(glob.glob(os.path.join(model_directory, "*.idf"))):
+        city = os.path.splitext(os.path.basename(idf))[0].rsplit("_", 1)[-1]
+
+        # NOTE - The station names are truncated to the length of the city name, so that the name of the airport
+        #  does not count against the match.
+        prefixes = {station[:len(_normalize(city))]: epw for station, epw in stations.items()}
+        match = difflib.get_close_matches(_normalize(city), prefixes, n=1, cutoff=0.8)
+
+        if match:
+            pairs[city] = (idf, prefixes[match[0]])
+
+    return pairs
+
+
+class Study:
+    """Optimize the setpoint schedules of a single building model under a single climate."""
+
+    def __init__(self, name: str, idf: str, epw: str, directory="../database/opt/studies/", pop_size=100,
+                 n_max_gen=None, n_max_evals=None, max_time=None,
+                 reference_front=parameters["IGD_REFERENCE_FRONT"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        name: str
+            The name of the study, which also names its output directory.
+
+        idf: str
+            The path to the model.
+
+        epw: str
+            The path to the weather file.
+
+        directory: str
+            The directory, inside which each study writes its logs, checkpoints and results to a directory of its own.
+
+        pop_size: int
+            The population size of the optimization algorithm.
+
+        n_max_gen, n_max_evals, max_time:
+            The limits of the termination criterion.
+
+        reference_front: str
+            The path to a .CSV file with the owPPD and NSE columns of the reference front of IGD+, e.g. the
+            pareto_front.csv file of a previous run of the study. If None, IGD+ is not tracked.
+        """
+
+        self.name = name
+        self.idf = idf
+        self.epw = epw
+        self.directory = os.path.join(directory, name)
+        self.pop_size = pop_size
+
+        self.termination_limits = {"n_max_gen": n_max_gen, "n_max_evals": n_max_evals, "max_time": max_time}
+        self.reference_front = reference_front
+
+    def run(self, scheduler, seed=None) -> dict:
+        """Run the optimization on a scheduler shared with the other studies and return its summary."""
+
+        utils.file_manager.create_directories(self.directory)
+
+        problem = OptimizationProblem(idf=self.idf, epw=self.epw, scheduler=scheduler)
+
+        convergence_callback = checkpoint.CheckpointCallback(
+            path=os.path.join(self.directory, "checkpoint.pkl.gz"),
+            log_writer=log_writer.GenerationLogWriter(directory=os.path.join(self.directory, "logs")),
+            pareto_archive=archive.ParetoArchive(),
+            indicator_tracker=indicators.IndicatorTracker(reference_set=self.reference_front))
+
+        start = time.time()
+        try:
+            try:
+                # NOTE - The output of concurrent studies would interleave, so the progress is only logged.
+                res = minimize(problem, build_algorithm(pop_size=self.pop_size),
+                               termination_criterion.get_termination_criterion(**self.termination_limits),
+                               callback=convergence_callback, seed=seed, verbose=False)
+            finally:
+                problem.shutdown()
+                convergence_callback.log_writer.close()
+
+            return self.summarize(res, problem, convergence_callback, start)
+        finally:
+            # NOTE - The spill files of the history are only deleted once the summary has been read from it.
+            convergence_callback.close()
+
+    def summarize(self, res, problem, convergence_callback, start: float) -> dict:
+        """Write the Pareto front of a completed run and return its summary."""
+
+        # The non-dominated designs are written as hourly setpoints, regardless of the encoding.
+        pareto_archive = convergence_callback.pareto_archive
+        schedules = problem.encoding.decode(pareto_archive.X)
+        results = pd.DataFrame(schedules, columns=["HTGSETP{:02d}".format(i + 1) for i in range(24)]
+                               + ["CLGSETP{:02d}".format(i + 1) for i in range(24)])
+        results["owPPD"], results["NSE"] = pareto_archive.F[:, 0], pareto_archive.F[:, 1]
+        results["Fidelity"] = pareto_archive.fidelity
+        results.to_csv(os.path.join(self.directory, "pareto_front.csv"), index=False)
+
+        evaluated_F = convergence_callback.archive()[1]
+        cache_statistics = problem.result_cache.statistics()
+        problem.result_cache.close()
+
+        return {"Study": self.name,
+                "IDF": os.path.basename(self.idf),
+                "EPW": os.path.basename(self.epw),
+                "Generations": res.algorithm.n_gen,
+                "Evaluations": res.algorithm.evaluator.n_eval,
+                # NOTE - Designs which failed to simulate or violated a constraint are penalized.
+                "Penalized": int(np.sum(np.all(evaluated_F == parameters["SIMULATION_PENALTY"], axis=1))),
+                "Cache Hit Rate": cache_statistics["hit_rate"],
+                "Front Size": len(pareto_archive),
+                "Hypervolume": convergence_callback.indicator_tracker.history["Hypervolume"][-1],
+                "IGD+": convergence_callback.indicator_tracker.history["IGD+"][-1],
+                "Min owPPD": pareto_archive.F[0, 0] if len(pareto_archive) else np.nan,
+                "Min NSE": pareto_archive.F[-1, 1] if len(pareto_archive) else np.nan,
+                "Wall Time (s)": time.time() - start}
+
+
+def run_batch(studies, n_workers=parameters["N_WORKERS"], max_studies=None,
+              summary_path="../database/opt/studies/summary.csv") -> pd.DataFrame:
+    """
+    Run several studies concurrently on a single pool of simulation workers and return their summary table.
+
+    Each study runs in a thread of its own and submits its simulations to the shared scheduler, so that the workers
+    keep simulating the designs of the other studies while one of them selects and mates its population.
+
+    NOTE - Since pymoo draws from the global NumPy RNG, concurrent studies are not reproducible individually. The
+     models of concurrent studies are parsed one at a time, since eppy keeps the state of its parser on its classes.
+    """
+
+    # NOTE - There is nothing to run when no model could be paired with a weather file.
+    if not studies:
+        return pd.DataFrame(columns=["Study"])
+
+    scheduler = sim.scheduler.JobScheduler(max_jobs=n_workers)
+
+    rows = []
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_studies or len(studies)) as executor:
+            futures = {executor.submit(study.run, scheduler, parameters["SEED"] + i): study
+                       for i, study in enumerate(studies)}
+
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    rows.append(future.result())
+                except Exception as exception:
+                    # NOTE - A failed study does not stop the rest of the batch.
+                    rows.append({"Study": futures[future].name, "Error": repr(exception)})
+    finally:
+        scheduler.close()
+
+    summary = pd.DataFrame(rows).sort_values("Study").reset_index(drop=True)
+
+    utils.file_manager.create_directories(os.path.dirname(os.path.abspath(summary_path)))
+    summary.to_csv(summary_path, index=False)
+
+    return summary
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for optimizing the ASHRAE 90.1 medium office prototype under every bundled climate."""
+
+        studies = [Study(city, idf, epw) for city, (idf, epw) in pair_models().items()]
+
+        print(run_batch(studies).to_string(index=False))
+
+
+    main()
@@ -15,17 +15,259 @@
 #          You should have received a copy of the GNU General Public License
 #          along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
 from pymoo.core.callback import Callback
 
+from prefs.parameters import parameters
+
+import utils.file_manager
+
+
+class GenerationHistory:
+    """Store one array per generation, keeping only the most recent generations in memory and spilling the older ones
+    to a memory-mapped file, while behaving like a list of arrays."""
+
+    def __init__(self, n_recent=parameters["HISTORY_GENERATIONS"], spill_directory="../database/opt/history/",
+                 dtype=np.float32) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        n_recent: int
+            The number of most recent generations kept in memory.
+
+        spill_directory: str
+            The directory, inside which the file holding the older generations is created.
+
+        dtype: numpy.dtype
+            The data type, to which the arrays are converted.
+        """
+
+        self.n_recent = n_recent
+        self.spill_directory = spill_directory
+        self.dtype = np.dtype(dtype)
+
+        # NOTE - The ring buffer is allocated when the first generation is appended, since its shape is unknown until
+        #  then, and it is only reallocated if a later generation is larger.
+        self.buffer = None
+        self.buffer_rows = np.zeros(n_recent, dtype=np.int64)
+
+        # The number of generations appended so far.
+        self.n_gen = 0
+
+        # The first row and the number of rows of each spilled generation inside the spill file.
+        self.spill_path = None
+        self.spill_offsets = []
+        self.spill_rows = 0
+
+        # The copy of the spill file made for the last checkpoint and the number of rows it holds.
+        self.snapshot_path = None
+        self.snapshot_rows = 0
+
+    def __getstate__(self):
+        # NOTE - A serialized history refers to the copy of its spill file made for the checkpoint, if it is up to
+        #  date, so that the checkpoint does not depend on the spill file, which is deleted once its run ends.
+        state = self.__dict__.copy()
+        if self.snapshot_path is not None and self.snapshot_rows == self.spill_rows:
+            state["spill_path"] = self.snapshot_path
+
+        return state
+
+    def __setstate__(self, state):
+        # NOTE - The histories of older checkpoints hold their spilled generations in memory instead.
+        spilled = state.pop("spilled", [])
+
+        self.__dict__.update(state)
+        self.snapshot_path = None
+        self.snapshot_rows = 0
+
+        # The spilled generations are copied to a new spill file, so that the resumed run never writes to the copy
+        # belonging to the checkpoint.
+        if self.spill_path is not None:
+            utils.file_manager.create_directories(self.spill_directory)
+
+            descriptor, spill_path = tempfile.mkstemp(prefix="history_", suffix=".bin", dir=self.spill_directory)
+            os.close(descriptor)
+
+            shutil.copyfile(self.spill_path, spill_path)
+            self.spill_path = spill_path
+
+        for values in spilled:
+            self._spill(values)
+
+    def __len__(self) -> int:
+        return self.n_gen
+
+    def __iter__(self):
+        for i in range(self.n_gen):
+            yield self[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.n_gen))]
+
+        if index < 0:
+            index += self.n_gen
+        if not 0 <= index < self.n_gen:
+            raise IndexError("The generation index is out of range.")
+
+        # NOTE - The generations inside the ring buffer are copied, since their slots are overwritten later on.
+        if index >= len(self.spill_offsets):
+            slot = index % self.n_recent
+            return self.buffer[slot, :self.buffer_rows[slot]].copy()
+        if self.spill_path is None:
+            raise ValueError("The spill file of the history has already been deleted.")
+
+        start, n_rows = self.spill_offsets[index]
+        n_columns = self.buffer.shape[2]
+        if n_rows == 0:
+            return np.empty((0, n_columns), dtype=self.dtype)
+
+        return np.memmap(self.spill_path, dtype=self.dtype, mode="r", offset=start * n_columns * self.dtype.itemsize,
+                         shape=(n_rows, n_columns))
+
+    def append(self, values) -> None:
+        """Append the array of a single generation, one row per individual."""
+
+        values = np.asarray(values, dtype=self.dtype)
+
+        if self.buffer is None:
+            self.buffer = np.empty((self.n_recent,) + values.shape, dtype=self.dtype)
+        elif values.shape[0] > self.buffer.shape[1]:
+            buffer = np.empty((self.n_recent, values.shape[0], self.buffer.shape[2]), dtype=self.dtype)
+            buffer[:, :self.buffer.shape[1]] = self.buffer
+            self.buffer = buffer
+
+        slot = self.n_gen % self.n_recent
+
+        # The oldest generation inside the ring buffer is spilled to disk before it is overwritten.
+        if self.n_gen >= self.n_recent:
+            self._spill(self.buffer[slot, :self.buffer_rows[slot]])
+
+        self.buffer[slot, :len(values)] = values
+        self.buffer_rows[slot] = len(values)
+
+        self.n_gen += 1
+
+    def _spill(self, values) -> None:
+        if self.spill_path is None:
+            utils.file_manager.create_directories(self.spill_directory)
+
+            descriptor, self.spill_path = tempfile.mkstemp(prefix="history_", suffix=".bin", dir=self.spill_directory)
+            os.close(descriptor)
+
+        # NOTE - The generations are written at their recorded position instead of being appended, so that a history
+        #  restored from a checkpoint overwrites any generations spilled after the checkpoint was written.
+        with open(self.spill_path, "r+b") as file:
+            file.seek(self.spill_rows * values.shape[1] * self.dtype.itemsize)
+            file.write(np.ascontiguousarray(values).tobytes())
+
+        self.spill_offsets.append((self.spill_rows, len(values)))
+        self.spill_rows += len(values)
+
+    def snapshot(self, path: str) -> None:
+        """Copy the spill file to a given path, which the serialized history refers to until more generations are
+        spilled."""
+
+        if self.spill_path is None:
+            return
+
+        # NOTE - The copy is streamed from disk, so that the spilled generations are never read back into memory, and
+        #  replaces the previous one in a single step.
+        temporary_path = path + ".tmp"
+        shutil.copyfile(self.spill_path, temporary_path)
+        os.replace(temporary_path, path)
+
+        self.snapshot_path = path
+        self.snapshot_rows = self.spill_rows
+
+    def close(self) -> None:
+        """Delete the spill file, after which only the generations inside the ring buffer remain readable."""
+
+        if self.spill_path is None:
+            return
+
+        utils.file_manager.delete_file(self.spill_path)
+        self.spill_path = None
+
 
 class ConvergenceCallback(Callback):
 
-    def __init__(self) -> None:
+    def __init__(self, log_writer=None, pareto_archive=None, indicator_tracker=None) -> None:
 
         super().__init__()
-        self.F = []
-        self.X = []
+        # NOTE - Only the most recent generations are kept in memory, while the rest are spilled to disk.
+        self.F = GenerationHistory()
+        self.X = GenerationHistory()
+
+        # The writer, to which each generation is streamed as soon as it completes.
+        self.log_writer = log_writer
+
+        # The archive of every non-dominated solution evaluated so far, including those which did not survive.
+        self.pareto_archive = pareto_archive
+
+        # The tracker of the performance indicators of the archive, which requires the archive.
+        self.indicator_tracker = indicator_tracker
+
+        # The designs evaluated during each generation, including those which did not survive.
+        self.evaluated_F = GenerationHistory()
+        self.evaluated_X = GenerationHistory()
 
     def notify(self, algorithm):
         self.F.append(algorithm.pop.get("F"))
         self.X.append(algorithm.pop.get("X"))
+
+        if self.log_writer is not None:
+            self.log_writer.write(algorithm.n_gen, algorithm.pop.get("X"), algorithm.pop.get("F"))
+
+        if algorithm.off is not None and len(algorithm.off):
+            self.evaluated_F.append(algorithm.off.get("F"))
+            self.evaluated_X.append(algorithm.off.get("X"))
+
+            if self.pareto_archive is not None:
+                # NOTE - The fidelity of each solution is None, unless the problem records it.
+                self.pareto_archive.update(algorithm.off.get("F"), algorithm.off.get("X"),
+                                           np.ravel(algorithm.off.get("fidelity")))
+
+            # NOTE - The archive of the duplicate elimination belongs to the copy of the algorithm being run, so it is
+            #  reached through the algorithm rather than kept by the callback.
+            design_archive = getattr(algorithm.eliminate_duplicates, "design_archive", None)
+            if design_archive is not None:
+                design_archive.add(algorithm.off.get("X"))
+
+        if self.pareto_archive is not None and self.indicator_tracker is not None:
+            indicators = self.indicator_tracker.update(algorithm.n_gen, self.pareto_archive)
+
+            if self.log_writer is not None:
+                self.log_writer.write_indicators(algorithm.n_gen, indicators)
+
+    def histories(self) -> dict:
+        """Return every history of the callback by name."""
+
+        return {"F": self.F, "X": self.X, "evaluated_F": self.evaluated_F, "evaluated_X": self.evaluated_X}
+
+    def snapshot(self, path: str) -> None:
+        """Copy the spill files of every history next to the checkpoint at a given path."""
+
+        for name, history in self.histories().items():
+            history.snapshot("{}.{}.bin".format(path, name))
+
+    def close(self) -> None:
+        """Delete the spill files of every history, which must only be called once the history has been analyzed."""
+
+        for history in self.histories().values():
+            history.close()
+
+    def archive(self) -> tuple:
+        """Return every design evaluated so far along with its objectives."""
+
+        if not self.evaluated_X:
+            return np.empty((0, 0)), np.empty((0, 0))
+
+        return np.vstack(list(self.evaluated_X)), np.vstack(list(self.evaluated_F))
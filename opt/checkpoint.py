@@ -0,0 +1,174 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import gzip
+import os
+import pickle
+import random
+import tempfile
+import time
+
+import numpy as np
+
+import callback
+
+from prefs.parameters import parameters
+
+import utils.file_manager
+
+
+def save_checkpoint(algorithm, path: str) -> None:
+    """Write the complete state of an optimization run, along with the state of the RNG engines, to a file."""
+
+    state = {"algorithm": algorithm,
+             "numpy_rng_state": np.random.get_state(),
+             "python_rng_state": random.getstate()}
+
+    directory = os.path.dirname(os.path.abspath(path))
+    utils.file_manager.create_directories(directory)
+
+    # NOTE - The spill files of the callback history are copied next to the checkpoint before it is written, so that
+    #  the checkpoint refers to copies holding at least as many generations as it does.
+    if hasattr(algorithm.callback, "snapshot"):
+        algorithm.callback.snapshot(path)
+
+    # NOTE - The checkpoint is first written to a temporary file inside the same directory, which then replaces the
+    #  previous checkpoint in a single step, so that a crash while writing never leaves a corrupt checkpoint behind.
+    descriptor, temporary_path = tempfile.mkstemp(prefix=".checkpoint_", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            with gzip.GzipFile(fileobj=file, mode="wb", compresslevel=6) as compressed_file:
+                pickle.dump(state, compressed_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+    except BaseException:
+        utils.file_manager.delete_file(temporary_path)
+        raise
+
+
+def load_checkpoint(path: str):
+    """Read the state of an optimization run from a file, restore the state of the RNG engines and return the
+    algorithm."""
+
+    with gzip.open(path, "rb") as file:
+        state = pickle.load(file)
+
+    np.random.set_state(state["numpy_rng_state"])
+    random.setstate(state["python_rng_state"])
+
+    return state["algorithm"]
+
+
+def resume(algorithm):
+    """Continue an optimization run, which has been loaded from its last checkpoint, until it terminates and return its
+    result."""
+
+    # NOTE - Checkpoints are written by the callback, which pymoo notifies before checking the termination criterion,
+    #  so the check of the last completed generation is repeated here.
+    algorithm.has_terminated = not algorithm.termination.do_continue(algorithm)
+    if algorithm.has_terminated:
+        algorithm.finalize()
+
+    while algorithm.has_next():
+        algorithm.next()
+
+    res = algorithm.result()
+    res.algorithm = algorithm
+
+    return res
+
+
+class CheckpointCallback(callback.ConvergenceCallback):
+    """Write the complete state of the optimization run to a checkpoint every few generations or minutes."""
+
+    def __init__(self, path="../database/opt/checkpoints/checkpoint.pkl.gz",
+                 n_gen=parameters["CHECKPOINT_GENERATIONS"], interval=parameters["CHECKPOINT_MINUTES"],
+                 log_writer=None, pareto_archive=None, indicator_tracker=None) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        path: str
+            The path to the checkpoint, which is overwritten every time.
+
+        n_gen: int
+            The number of generations between two consecutive checkpoints. If None, only the interval is considered.
+
+        interval: float
+            The number of minutes between two consecutive checkpoints. If None, only the generations are considered.
+
+        log_writer: log_writer.GenerationLogWriter
+            The writer, to which each generation is streamed as soon as it completes.
+
+        pareto_archive: archive.ParetoArchive
+            The archive of every non-dominated solution evaluated so far.
+
+        indicator_tracker: indicators.IndicatorTracker
+            The tracker of the hypervolume and IGD+ of the archive after every generation.
+        """
+
+        super().__init__(log_writer=log_writer, pareto_archive=pareto_archive,
+                         indicator_tracker=indicator_tracker)
+
+        self.path = path
+        self.n_gen = n_gen
+        self.interval = interval
+
+        self.last_checkpoint = None
+
+    def notify(self, algorithm):
+        super().notify(algorithm)
+
+        now = time.time()
+        if self.last_checkpoint is None:
+            self.last_checkpoint = now
+
+        if (self.n_gen is not None and algorithm.n_gen % self.n_gen == 0) or \
+                (self.interval is not None and now - self.last_checkpoint >= 60 * self.interval):
+            self.last_checkpoint = now
+
+            save_checkpoint(algorithm, self.path)
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for resuming the last optimization run."""
+
+        algorithm = load_checkpoint("../database/opt/checkpoints/checkpoint.pkl.gz")
+
+        try:
+            res = resume(algorithm)
+        finally:
+            # Kill any simulations still running when the optimization terminates.
+            algorithm.problem.shutdown()
+
+            # NOTE - The last part file of a log written in the Parquet format is only complete once it is closed.
+            if algorithm.callback.log_writer is not None:
+                algorithm.callback.log_writer.close()
+
+            algorithm.callback.close()
+
+        print("OPTIMIZATION WALL TIME =\n" + "{}".format(res.exec_time))
+        print("GENERATIONS =\n" + "{}".format(res.algorithm.n_gen))
+
+
+    main()
@@ -0,0 +1,99 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+from prefs.parameters import parameters
+
+
+class Deadband:
+    """Require the cooling setpoint to exceed the heating setpoint of each hour by a minimum deadband."""
+
+    def __init__(self, deadband=parameters["SETPOINT_DEADBAND"]) -> None:
+        self.deadband = deadband
+
+    def evaluate(self, schedules) -> np.ndarray:
+        return np.max(schedules[:, :24] + self.deadband - schedules[:, 24:], axis=1)
+
+
+class MaxRamp:
+    """Limit the change of each setpoint from one hour to the next, including from midnight to the next day."""
+
+    def __init__(self, max_ramp=parameters["SETPOINT_MAX_RAMP"]) -> None:
+        self.max_ramp = max_ramp
+
+    def evaluate(self, schedules) -> np.ndarray:
+        heating, cooling = schedules[:, :24], schedules[:, 24:]
+
+        # NOTE - The schedules repeat every day, so the last hour is followed by the first one.
+        ramps = np.hstack([np.abs(np.roll(heating, -1, axis=1) - heating),
+                           np.abs(np.roll(cooling, -1, axis=1) - cooling)])
+
+        return np.max(ramps, axis=1) - self.max_ramp
+
+
+class ComfortBand:
+    """Keep the heating setpoint above and the cooling setpoint below the limits of acceptable comfort."""
+
+    def __init__(self, comfort_band=parameters["COMFORT_BAND"]) -> None:
+        self.min_heating, self.max_cooling = comfort_band
+
+    def evaluate(self, schedules) -> np.ndarray:
+        return np.maximum(np.max(self.min_heating - schedules[:, :24], axis=1),
+                          np.max(schedules[:, 24:] - self.max_cooling, axis=1))
+
+
+class ConstraintSet:
+    """Evaluate a set of analytic constraints on the hourly setpoints of a whole population at once, so that infeasible
+    designs are identified before they are simulated."""
+
+    def __init__(self, constraints) -> None:
+        self.constraints = tuple(constraints)
+
+    def __len__(self) -> int:
+        return len(self.constraints)
+
+    def evaluate(self, schedules) -> np.ndarray:
+        """Return the violation of each constraint, one column per constraint, which is feasible if non-positive."""
+
+        schedules = np.atleast_2d(np.asarray(schedules, dtype=float))
+
+        G = np.empty((len(schedules), len(self.constraints)))
+        for j, constraint in enumerate(self.constraints):
+            G[:, j] = constraint.evaluate(schedules)
+
+        return G
+
+    def is_feasible(self, schedules) -> np.ndarray:
+        """Return whether each design satisfies every constraint."""
+
+        return np.all(self.evaluate(schedules) <= 0, axis=1)
+
+
+def default_constraints() -> ConstraintSet:
+    """Return the constraints enabled by the preferences."""
+
+    constraints = [Deadband()]
+
+    if parameters["SETPOINT_MAX_RAMP"] is not None:
+        constraints.append(MaxRamp())
+
+    if parameters["COMFORT_BAND"] is not None:
+        constraints.append(ComfortBand())
+
+    return ConstraintSet(constraints)
@@ -0,0 +1,157 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from prefs.parameters import parameters
+
+
+class Encoding(ABC):
+    """Map a reduced design vector to the 24 hourly heating and 24 hourly cooling setpoints of the sim model."""
+
+    def __init__(self, bounds) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        bounds: numpy.ndarray
+            The lower and upper bounds of the 48 hourly setpoints, one per row, as read from variable_bounds.csv.
+        """
+
+        self.bounds = np.asarray(bounds, dtype=float)
+
+        self.xl = None
+        self.xu = None
+
+    @property
+    def n_var(self) -> int:
+        return len(self.xl)
+
+    @abstractmethod
+    def decode(self, X) -> np.ndarray:
+        """Return the 48 hourly setpoints of each design vector, one per row."""
+
+        pass
+
+    def _clip(self, schedules) -> np.ndarray:
+        # NOTE - A variable shared by several hours spans the bounds of all of them, so the decoded setpoints are
+        #  clipped to the bounds of each individual hour.
+        return np.clip(schedules, self.bounds[0], self.bounds[1])
+
+
+class CoarseEncoding(Encoding):
+    """Share a single heating and cooling setpoint between consecutive hours."""
+
+    def __init__(self, bounds, step=parameters["DF_FREQ_NUM"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        bounds: numpy.ndarray
+            The lower and upper bounds of the 48 hourly setpoints, one per row, as read from variable_bounds.csv.
+
+        step: int
+            The number of hours sharing a single setpoint.
+        """
+
+        super().__init__(bounds)
+
+        if 24 % step:
+            raise ValueError("The number of hours sharing a single setpoint must divide a day exactly.")
+        self.step = step
+
+        blocks = self.bounds.reshape(2, -1, step)
+        self.xl = blocks[0].min(axis=1)
+        self.xu = blocks[1].max(axis=1)
+
+    def decode(self, X) -> np.ndarray:
+        return self._clip(np.repeat(np.atleast_2d(np.asarray(X, dtype=float)), self.step, axis=1))
+
+
+class HourlyEncoding(CoarseEncoding):
+    """Use one heating and one cooling setpoint per hour, i.e. the 48 setpoints themselves."""
+
+    def __init__(self, bounds) -> None:
+        super().__init__(bounds, step=1)
+
+
+class BlockEncoding(Encoding):
+    """Use piecewise-constant heating and cooling setpoints over a few blocks of the day, whose start times are
+    variables too."""
+
+    def __init__(self, bounds, blocks=parameters["SCHEDULE_BLOCKS"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        bounds: numpy.ndarray
+            The lower and upper bounds of the 48 hourly setpoints, one per row, as read from variable_bounds.csv.
+
+        blocks: tuple
+            The name, earliest and latest start hour of each block, in chronological order. The hours before the start
+            of the first block belong to the last one.
+        """
+
+        super().__init__(bounds)
+
+        self.blocks = tuple(blocks)
+        n_blocks = len(self.blocks)
+
+        earliest = np.array([block[1] for block in self.blocks], dtype=float)
+        latest = np.array([block[2] for block in self.blocks], dtype=float)
+        if np.any(earliest > latest) or np.any(latest[:-1] > earliest[1:]):
+            raise ValueError("The start hours of the schedule blocks must be ordered and must not overlap.")
+
+        # NOTE - The design vector consists of the heating setpoints, the cooling setpoints and the start hours of
+        #  the blocks, in this order.
+        self.xl = np.concatenate([np.full(n_blocks, self.bounds[0, :24].min()),
+                                  np.full(n_blocks, self.bounds[0, 24:].min()), earliest])
+        self.xu = np.concatenate([np.full(n_blocks, self.bounds[1, :24].max()),
+                                  np.full(n_blocks, self.bounds[1, 24:].max()), latest])
+
+    def decode(self, X) -> np.ndarray:
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        n_blocks = len(self.blocks)
+
+        # Each hourly value holds from the start of its hour, so it belongs to the last block started by then.
+        starts = np.floor(X[:, 2 * n_blocks:])
+        active = np.sum(starts[:, None, :] <= np.arange(24)[None, :, None], axis=2) - 1
+        active %= n_blocks
+
+        heating = np.take_along_axis(X[:, :n_blocks], active, axis=1)
+        cooling = np.take_along_axis(X[:, n_blocks:2 * n_blocks], active, axis=1)
+
+        return self._clip(np.hstack([heating, cooling]))
+
+
+def get_encoding(name, bounds) -> Encoding:
+    """Return the encoding of the design space with a given name, i.e. hourly, coarse, or block."""
+
+    if name.lower() == "hourly":
+        return HourlyEncoding(bounds)
+    elif name.lower() == "coarse":
+        return CoarseEncoding(bounds)
+    elif name.lower() == "block":
+        return BlockEncoding(bounds)
+    else:
+        raise NameError("The design space encoding must be set to either hourly, coarse, or block.")
@@ -0,0 +1,95 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+from prefs.parameters import parameters
+
+
+def read_reference_set(path: str) -> np.ndarray:
+    """Read the objectives of a reference front from a .CSV file with owPPD and NSE columns, such as the
+    pareto_front.csv file written by each study of opt/batch.py."""
+
+    # NOTE - pandas is imported lazily, since the reference set is only read once per run.
+    import pandas as pd
+
+    return pd.read_csv(path, usecols=["owPPD", "NSE"]).to_numpy(dtype=float)
+
+
+class IndicatorTracker:
+    """Track the hypervolume and inverted generational distance plus of the Pareto archive after every generation."""
+
+    def __init__(self, reference_point=parameters["HV_REFERENCE_POINT"],
+                 reference_set=parameters["IGD_REFERENCE_FRONT"], margin=0.1) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        reference_point: tuple
+            The reference point of the hypervolume, in the units of the objectives. If None, it is set to the nadir
+            point of the first non-empty front, widened by the margin, and kept fixed afterwards.
+
+        reference_set: numpy.ndarray or str
+            The reference set of the inverted generational distance plus, e.g. the front of a previous long run, or the
+            path to a .CSV file holding it. If None, the indicator is not tracked.
+
+        margin: float
+            The fraction of the range of each objective, by which the nadir point is widened.
+        """
+
+        self.reference_point = reference_point
+        if isinstance(reference_set, str):
+            reference_set = read_reference_set(reference_set)
+        self.reference_set = None if reference_set is None else np.asarray(reference_set, dtype=float)
+        self.margin = margin
+
+        # The indicators of each generation.
+        self.history = {"Generation": [], "Front Size": [], "Hypervolume": [], "IGD+": []}
+
+    def update(self, n_gen: int, pareto_archive) -> dict:
+        """Record the indicators of the Pareto archive after a generation and return them."""
+
+        if not len(pareto_archive):
+            hypervolume = np.nan
+        else:
+            if pareto_archive.reference_point is None:
+                if self.reference_point is None:
+                    F = pareto_archive.F
+                    nadir, ideal = F.max(axis=0), F.min(axis=0)
+
+                    # NOTE - A front of a single solution has no range, so the nadir point is widened by its own
+                    #  magnitude instead.
+                    span = np.where(nadir > ideal, nadir - ideal, np.maximum(np.abs(nadir), 1.))
+                    self.reference_point = tuple(float(value) for value in nadir + self.margin * span)
+
+                pareto_archive.set_reference_point(self.reference_point)
+
+            hypervolume = pareto_archive.hypervolume
+
+        if self.reference_set is None or not len(pareto_archive):
+            igd_plus = np.nan
+        else:
+            igd_plus = pareto_archive.igd_plus(self.reference_set)
+
+        indicators = {"Generation": n_gen, "Front Size": len(pareto_archive), "Hypervolume": hypervolume,
+                      "IGD+": igd_plus}
+        for key, value in indicators.items():
+            self.history[key].append(value)
+
+        return indicators
@@ -0,0 +1,245 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import csv
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from prefs.parameters import parameters
+
+import utils.file_manager
+
+
+# The columns of every long-format log file.
+COLUMNS = ("Generation", "Individual", "Variable", "Value")
+
+# The file extension of each log format.
+EXTENSIONS = {"csv": ".csv", "arrow": ".arrows", "parquet": ".parquet"}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("The Arrow and Parquet log formats require pyarrow.") from error
+
+    return pyarrow
+
+
+def _schema():
+    """Return the schema of the Arrow and Parquet log files."""
+
+    pyarrow = _import_pyarrow()
+
+    return pyarrow.schema([("Generation", pyarrow.int32()),
+                           ("Individual", pyarrow.int32()),
+                           ("Variable", pyarrow.dictionary(pyarrow.int16(), pyarrow.string())),
+                           ("Value", pyarrow.float64())])
+
+
+class GenerationLogWriter:
+    """Append the design and objective space of each generation to long-format log files as soon as it completes."""
+
+    def __init__(self, directory="../database/opt/logs/stream/", log_format=parameters["LOG_FORMAT"],
+                 objective_names=("owPPD", "NSE")) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        directory: str
+            The directory, inside which the design_space and objective_space log files are written.
+            NOTE - This must not be the directory of the wide-format logs written by main.write_logs, which share the
+             same names.
+
+        log_format: str
+            The format of the log files, which is either "csv", "arrow" (i.e. the Arrow IPC streaming format) or
+            "parquet", the last two of which require pyarrow.
+            NOTE - Parquet files can only be read after the writer has been closed, so use either of the other two
+             formats to follow the progress of a run while it is still going.
+
+        objective_names: tuple
+            The name of each objective, in the same order as the columns of F.
+        """
+
+        if log_format not in EXTENSIONS:
+            raise ValueError('Log format must be set to either "csv", "arrow" or "parquet".')
+        if log_format != "csv":
+            _import_pyarrow()
+
+        self.directory = directory
+        self.log_format = log_format
+        self.objective_names = objective_names
+
+        # NOTE - The files are opened lazily, so that the writer can be serialized along with a checkpoint.
+        self._writers = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_writers"] = {}
+
+        return state
+
+    def path(self, name: str) -> str:
+        """Return the path to the first log file of a given name."""
+
+        return os.path.join(self.directory, name + EXTENSIONS[self.log_format])
+
+    def _open(self, name: str):
+        utils.file_manager.create_directories(self.directory)
+
+        path = self.path(name)
+        if self.log_format == "csv":
+            # CSV files are simply appended to when a run is resumed, as long as they are long-format logs themselves.
+            if os.path.isfile(path) and os.path.getsize(path):
+                with open(path, "r", newline="") as file:
+                    header = next(csv.reader(file), None)
+                if tuple(header or ()) != COLUMNS:
+                    raise ValueError("The file {} exists, but it is not a long-format log.".format(path))
+
+                file = open(path, "a", newline="")
+                writer = csv.writer(file)
+            else:
+                file = open(path, "w", newline="")
+                writer = csv.writer(file)
+                writer.writerow(COLUMNS)
+
+            return file, writer
+
+        pyarrow = _import_pyarrow()
+
+        # NOTE - Arrow and Parquet files cannot be appended to once closed, so a resumed run writes to a new part.
+        part = 0
+        while os.path.isfile(path):
+            part += 1
+            path = os.path.join(self.directory, "{}.{}{}".format(name, part, EXTENSIONS[self.log_format]))
+
+        schema = _schema()
+
+        if self.log_format == "arrow":
+            file = pyarrow.OSFile(path, "wb")
+            return file, pyarrow.ipc.new_stream(file, schema)
+        else:
+            return None, pyarrow.parquet.ParquetWriter(path, schema)
+
+    def _write(self, name: str, n_gen: int, values: np.ndarray, variables: list) -> None:
+        if name not in self._writers:
+            self._writers[name] = self._open(name)
+        file, writer = self._writers[name]
+
+        n_individuals, n_variables = values.shape
+
+        if self.log_format == "csv":
+            writer.writerows((n_gen, i, variables[j], repr(float(values[i, j])))
+                             for i in range(n_individuals) for j in range(n_variables))
+
+            # Make each generation visible to readers as soon as it has been written.
+            file.flush()
+            return
+
+        pyarrow = _import_pyarrow()
+
+        batch = pyarrow.record_batch(
+            [pyarrow.array(np.full(values.size, n_gen, dtype=np.int32)),
+             pyarrow.array(np.repeat(np.arange(n_individuals, dtype=np.int32), n_variables)),
+             pyarrow.DictionaryArray.from_arrays(np.tile(np.arange(n_variables, dtype=np.int16), n_individuals),
+                                                 variables),
+             pyarrow.array(values.ravel().astype(np.float64))],
+            schema=_schema())
+
+        if self.log_format == "arrow":
+            writer.write_batch(batch)
+            file.flush()
+        else:
+            writer.write_table(pyarrow.Table.from_batches([batch]))
+
+    def write(self, n_gen: int, X, F) -> None:
+        """Append the design and objective space of a single generation, one individual per row, to the log files."""
+
+        X = np.asarray(X, dtype=float)
+        F = np.asarray(F, dtype=float)
+
+        self._write("design_space", n_gen, X, ["X" + str(i) for i in range(X.shape[1])])
+        self._write("objective_space", n_gen, F, list(self.objective_names))
+
+    def write_indicators(self, n_gen: int, indicators: dict) -> None:
+        """Append the performance indicators of a single generation to the log files."""
+
+        names = [name for name in indicators if name != "Generation"]
+
+        self._write("indicators", n_gen, np.array([[indicators[name] for name in names]], dtype=float), names)
+
+    def close(self) -> None:
+        """Close the log files."""
+
+        for file, writer in self._writers.values():
+            if self.log_format != "csv":
+                writer.close()
+            if file is not None:
+                file.close()
+
+        self._writers = {}
+
+
+def read_log(directory: str, name: str, log_format=parameters["LOG_FORMAT"]):
+    """
+    Read all parts of a long-format log file into a pandas.DataFrame.
+
+    NOTE - The generations written after the last checkpoint of an interrupted run appear twice, in which case only
+     their last occurrence is kept.
+    """
+
+    root, extension = os.path.join(directory, name), EXTENSIONS[log_format]
+    paths = [root + extension] + sorted(glob.glob(root + ".*" + extension),
+                                        key=lambda path: int(path[len(root) + 1:-len(extension)]))
+
+    frames = []
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+
+        if log_format == "csv":
+            frames.append(pd.read_csv(path))
+        elif log_format == "arrow":
+            pyarrow = _import_pyarrow()
+            with pyarrow.OSFile(path, "rb") as file:
+                frames.append(pyarrow.ipc.open_stream(file).read_pandas())
+        else:
+            pyarrow = _import_pyarrow()
+            frames.append(pyarrow.parquet.read_table(path).to_pandas())
+
+    dataframe = pd.concat(frames, ignore_index=True)
+    dataframe["Variable"] = dataframe["Variable"].astype(str)
+
+    return dataframe.drop_duplicates(["Generation", "Individual", "Variable"], keep="last").reset_index(drop=True)
+
+
+def export_csv(directory="../database/opt/logs/stream/", log_format=parameters["LOG_FORMAT"]) -> None:
+    """Export the Arrow or Parquet log files inside a directory to CSV files with the same names."""
+
+    for name in ("design_space", "objective_space", "indicators"):
+        # NOTE - The indicators are only logged when they are tracked.
+        if not glob.glob(os.path.join(directory, name) + "*" + EXTENSIONS[log_format]):
+            continue
+
+        read_log(directory, name, log_format).to_csv(os.path.join(directory, name + ".csv"), index=False)
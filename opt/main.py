@@ -39,100 +39,374 @@ import math
 import os
 import warnings
 
-import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FormatStrFormatter
-
 import numpy as np
 import pandas as pd
 
-from pymoo.core.problem import ElementwiseProblem
+from pymoo.core.problem import Problem
 from pymoo.algorithms.moo.nsga2 import NSGA2
 
 from pymoo.optimize import minimize
-from pymoo.factory import get_performance_indicator
-from pymoo.factory import get_decomposition
-from pymoo.factory import get_decision_making
 
 import algorithm
-import callback
+import archive
+import checkpoint
+import constraints
+import encoding
+import indicators
+import log_writer
 import monitor
+import steady_state
+import surrogate
 import termination_criterion
 
 import prefs.colors
 import prefs.parameters
 
-import sim.runner
-import sim.modifier
-import sim.reader
+import sim.cache
+import sim.evaluator
+import sim.screening
 
 import utils.file_manager
 import utils.optimization
 
 
-class OptimizationProblem(ElementwiseProblem):
+class OptimizationProblem(Problem):
     """Formulate the sim problem."""
 
-    def __init__(self, decimals=prefs.parameters.parameters["SAMPLING_DECIMALS"]):
+    def __init__(self, decimals=prefs.parameters.parameters["SAMPLING_DECIMALS"],
+                 n_workers=prefs.parameters.parameters["N_WORKERS"],
+                 design_encoding=prefs.parameters.parameters["ENCODING"],
+                 idf="../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf",
+                 epw="../database/sim/model/USA_AZ_Tucson-Davis-Monthan.AFB.722745_TMY3.epw", scheduler=None,
+                 screening=prefs.parameters.parameters["SCREENING"]):
         """..."""
 
         variable_bounds = utils.optimization.read_problem_bounds("../database/opt/model/variable_bounds.csv")
 
-        # The number of design space variables depends on the sim unit time.
-        super().__init__(n_var=48, n_obj=2, xl=variable_bounds[0],
-                         xu=utils.optimization.close_bound(variable_bounds[1], decimals=decimals))
+        # The number of design space variables depends on the encoding of the hourly setpoints.
+        self.encoding = encoding.get_encoding(design_encoding, variable_bounds)
+
+        # The analytic constraints are checked before any simulation is run.
+        self.constraints = constraints.default_constraints()
+
+        super().__init__(n_var=self.encoding.n_var, n_obj=2, n_constr=len(self.constraints), xl=self.encoding.xl,
+                         xu=utils.optimization.close_bound(self.encoding.xu, decimals=decimals))
+
+        # Each population generation is evaluated as a batch of concurrent simulations.
+        # NOTE - Several problems may share a single scheduler, so that their simulations interleave.
+        self.simulation_pool = sim.evaluator.SimulationPool(idf, epw, n_workers=n_workers, scheduler=scheduler)
+
+        # Designs which have already been simulated, either during this or any previous run, are not simulated again.
+        self.result_cache = sim.cache.ResultCache(idf, epw, decimals=decimals,
+                                                  warm_start=self.simulation_pool.warm_start)
+
+        # NOTE - Each design is first simulated over a few representative weeks, and then over the full run period
+        #  only if it stays competitive.
+        # NOTE - The screening weeks are read from the .STAT file next to the weather file, without which the designs
+        #  are only simulated over the full run period.
+        if screening and sim.screening.find_stat(epw, missing_ok=True) is None:
+            warnings.warn("The weather file {} is not accompanied by a .STAT file, so screening is disabled.".format(
+                epw))
+            screening = False
+
+        self.screening = screening
+        if screening:
+            periods = sim.screening.screening_periods(epw)
 
-    def _evaluate(self, x, out, *args, **kwargs):
+            self.screening_pool = sim.evaluator.SimulationPool(idf, epw, n_workers=n_workers,
+                                                               scheduler=self.simulation_pool.scheduler,
+                                                               run_periods=periods)
+            self.screening_cache = sim.cache.ResultCache(idf, epw, decimals=decimals, fidelity=repr(periods),
+                                                         warm_start=self.screening_pool.warm_start)
+
+            # The non-dominated full-fidelity results, against which the screened designs compete.
+            self.full_archive = archive.ParetoArchive()
+
+            # The mean ratio of the full-fidelity to the screened objectives, by which the latter are calibrated.
+            self.calibration_sum = np.zeros(2)
+            self.calibration_count = 0
+
+    def _evaluate(self, X, out, *args, **kwargs):
         """..."""
 
-        # Heating Schedule
-        sim.modifier.modify_schedule(x[00:24], "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf", 29)
+        # NOTE - The results are cached by hourly setpoints, so that they are shared between encodings.
+        schedules = self.encoding.decode(X)
+
+        G = self.constraints.evaluate(schedules)
+
+        # NOTE - Infeasible designs are penalized without being simulated, while the constraint violations let the
+        #  survival selection process rank them by how infeasible they are.
+        F = np.empty((len(X), self.n_obj))
+        F[:] = prefs.parameters.parameters["SIMULATION_PENALTY"]
+
+        feasible = np.flatnonzero(np.all(G <= 0, axis=1))
+        keys = self.result_cache.keys(schedules[feasible])
 
-        # Cooling Schedule
-        sim.modifier.modify_schedule(x[24:48], "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf", 36)
+        # NOTE - Infeasible designs are neither screened nor fully simulated.
+        fidelity = np.full(len(X), "none", dtype=object)
+        fidelity[feasible] = "full"
 
-        # Simulation Controller
-        sim.runner.run_eplus("../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf",
-                                        "../database/sim/model/USA_AZ_Tucson-Davis-Monthan.AFB.722745_TMY3.epw",
-                             set_idd=False)
+        pending = {}
+        for i, key, f in zip(feasible, keys, self.result_cache.get(keys)):
+            if f is None:
+                # NOTE - Designs which are equal after rounding are simulated only once per batch.
+                pending.setdefault(key, []).append(i)
+            else:
+                F[i] = f
+
+        screened = None
+        if pending and self.screening:
+            screened = self._screen(schedules, pending, F, fidelity)
+            pending = {key: pending[key] for key in screened}
+
+        if pending:
+            first = [indices[0] for indices in pending.values()]
+            results, failed = self.simulation_pool.map(schedules[first])
+
+            # NOTE - The penalized objectives of failed simulations are not cached, so that they can be retried later.
+            self.result_cache.put([key for key, f in zip(pending, failed) if not f], results[~failed])
+
+            for indices, f in zip(pending.values(), results):
+                F[indices] = f
+
+            if self.screening:
+                self._calibrate(np.array([screened[key] for key in pending]), results, failed)
+
+        if self.screening:
+            self.full_archive.update(F[fidelity == "full"])
 
         # Objectives
-        nse = sim.reader.read_nse()
-        ppd = sim.reader.read_ppd()
+        out["F"] = F
+
+        # Constraints
+        out["G"] = G
+
+        # NOTE - The fidelity of each result is stored along with its design, so that the archives can record it.
+        out["fidelity"] = fidelity
+
+    def shutdown(self) -> None:
+        """Kill any simulations still running and delete the run directories of every simulation pool."""
+
+        self.simulation_pool.shutdown()
+        if self.screening:
+            self.screening_pool.shutdown()
+
+    @property
+    def calibration(self) -> np.ndarray:
+        """The factors, by which the screened objectives are multiplied to estimate the full-fidelity ones."""
+
+        return self.calibration_sum / self.calibration_count if self.calibration_count else np.ones(2)
+
+    def _screen(self, schedules, pending: dict, F, fidelity) -> dict:
+        """
+        Simulate the pending designs over the screening periods, assign their calibrated estimates to those which are
+        not competitive, and return the screened objectives of the rest, which are promoted to the full run period.
+        """
+
+        first = [indices[0] for indices in pending.values()]
+        keys = self.screening_cache.keys(schedules[first])
+
+        results = self.screening_cache.get(keys)
+        missing = [j for j, f in enumerate(results) if f is None]
+        if missing:
+            simulated, failed = self.screening_pool.map(schedules[[first[j] for j in missing]])
+            self.screening_cache.put([keys[j] for j, f in zip(missing, failed) if not f], simulated[~failed])
+
+            for j, f in zip(missing, simulated):
+                results[j] = f
+
+        promoted = {}
+        for (key, indices), f in zip(pending.items(), results):
+            # NOTE - Failed screening simulations are promoted, so that the designs are simulated once more.
+            if np.all(f == prefs.parameters.parameters["SIMULATION_PENALTY"]):
+                promoted[key] = f
+                continue
+
+            estimate = f * self.calibration
+
+            # A design stays competitive unless even a relatively better version of it is dominated by the
+            # full-fidelity front.
+            if self.full_archive.is_dominated(estimate * (1 - prefs.parameters.parameters["PROMOTION_MARGIN"])):
+                F[indices] = estimate
+                fidelity[indices] = "screening"
+            else:
+                promoted[key] = f
+
+        return promoted
+
+    def _calibrate(self, screened, results, failed) -> None:
+        """Update the calibration of the screened objectives using the designs simulated at both fidelities."""
+
+        # NOTE - The designs whose simulation failed at either fidelity are ignored.
+        penalty = prefs.parameters.parameters["SIMULATION_PENALTY"]
+        valid = ~failed & ~np.all(screened == penalty, axis=1) & np.all(screened > 0, axis=1)
+
+        self.calibration_sum += np.sum(results[valid] / screened[valid], axis=0)
+        self.calibration_count += int(np.sum(valid))
+
+
+def build_algorithm(pop_size=100):
+    """Return the optimization algorithm configured by the preferences."""
+
+    # NOTE - The surrogate-assisted variant only evaluates the most promising or uncertain offspring by simulation.
+    return (surrogate.SurrogateAssistedNSGA2 if prefs.parameters.parameters["SURROGATE_ASSISTED"]
+            else NSGA2)(pop_size=pop_size,
+                        sampling=algorithm.SamplingScheme(),
+                        # NOTE - Check the parent population selection process.
+                        crossover=algorithm.CrossoverScheme(
+                            eta=prefs.parameters.parameters["CROSSOVER_ETA"],
+                            prob=prefs.parameters.parameters["CROSSOVER_PROBABILITY"]),
+                        mutation=algorithm.MutationScheme(
+                            eta=prefs.parameters.parameters["MUTATION_ETA"]),
+                        # NOTE - The offspring are rounded like the initial population.
+                        repair=algorithm.RepairScheme(),
+                        # NOTE - Check the population survival selection process.
+                        eliminate_duplicates=algorithm.DuplicateEliminationScheme(
+                            design_archive=archive.DesignArchive()
+                            if prefs.parameters.parameters["ELIMINATE_EVALUATED"] else None)
+                        )
+
+
+# The default configuration of a single optimization run, which is overridden by the configuration given to
+# run_optimization.
+DEFAULT_CONFIG = {
+    "idf": "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf",
+    "epw": "../database/sim/model/USA_AZ_Tucson-Davis-Monthan.AFB.722745_TMY3.epw",
+    "pop_size": 100,
+    "n_max_gen": None,
+    "n_max_evals": None,
+    "max_time": None,
+    "n_workers": prefs.parameters.parameters["N_WORKERS"],
+    "encoding": prefs.parameters.parameters["ENCODING"],
+    "checkpoint_path": "../database/opt/checkpoints/checkpoint.pkl.gz",
+    # NOTE - The long-format logs are streamed apart from the wide-format ones written by write_logs.
+    "log_directory": "../database/opt/logs/stream/",
+    "reference_front": prefs.parameters.parameters["IGD_REFERENCE_FRONT"],
+    "resume": prefs.parameters.parameters["RESUME"],
+    "seed": prefs.parameters.parameters["SEED"],
+    "steady_state": prefs.parameters.parameters["STEADY_STATE"],
+    "verbose": True
+}
+
+
+def run_optimization(config=None):
+    """
+    Run a complete optimization and return its result, whose problem and algorithm hold the simulation cache and the
+    convergence callback, respectively.
 
-        out["F"] = [ppd, nse]
+    NOTE - The history of the convergence callback remains readable until the callback is closed, which deletes its
+     spill files and is left to the caller once the result has been analyzed.
 
+    ----------------
+    Input Parameters
+    ----------------
 
-optimization_problem = OptimizationProblem()
+    config: dict
+        The settings of the run, which override those of DEFAULT_CONFIG.
+    """
 
-optimization_algorithm = NSGA2(pop_size=100,
-                               sampling=algorithm.SamplingScheme(),
-                               # NOTE - Check the parent population selection process.
-                               crossover=algorithm.CrossoverScheme(
-                                   eta=prefs.parameters.parameters["CROSSOVER_ETA"],
-                                   prob=prefs.parameters.parameters["CROSSOVER_PROBABILITY"]),
-                               mutation=algorithm.MutationScheme(eta=prefs.parameters.parameters["MUTATION_ETA"]),
-                               # NOTE - Check the population survival selection process.
-                               eliminate_duplicates=True
-                               )
+    config = {**DEFAULT_CONFIG, **(config or {})}
 
+    optimization_problem = OptimizationProblem(n_workers=config["n_workers"], design_encoding=config["encoding"],
+                                               idf=config["idf"], epw=config["epw"])
 
-# The termination criterion is checked against before each new generation. It cannot be checked againts before the
-# whole population is evaluated, so the smallest input arguments it can take are: (i) n_max_gen = 1, (ii) n_max_evals
-# = pop_size, and (iii) max_time = pop_size * mean (or max) sim time.
+    optimization_algorithm = build_algorithm(pop_size=config["pop_size"])
 
-# Similarly, the possible values of those input arguments are: (i) n_max_gen = k, where k is an integer,
-# (ii) n_max_evals = k * pop_size, and (iii) max_time = k * pop_size * mean (or max) sim time.
+    # The termination criterion is checked against before each new generation. It cannot be checked againts before
+    # the whole population is evaluated, so the smallest input arguments it can take are: (i) n_max_gen = 1,
+    # (ii) n_max_evals = pop_size, and (iii) max_time = pop_size * mean (or max) sim time.
 
-# Other values are also valid, but may yield unexpected results. For example, when pop_size = 100 and n_max_evals =
-# 150, then the opt will stop after the evaluation of the second generation is finished.
+    # Similarly, the possible values of those input arguments are: (i) n_max_gen = k, where k is an integer,
+    # (ii) n_max_evals = k * pop_size, and (iii) max_time = k * pop_size * mean (or max) sim time.
 
-termination_criterion = termination_criterion.TerminationCriterion()
+    # Other values are also valid, but may yield unexpected results. For example, when pop_size = 100 and n_max_evals
+    # = 150, then the opt will stop after the evaluation of the second generation is finished.
 
-convergence_callback = callback.ConvergenceCallback()
+    termination = termination_criterion.get_termination_criterion(n_max_gen=config["n_max_gen"],
+                                                                  n_max_evals=config["n_max_evals"],
+                                                                  max_time=config["max_time"])
 
-res = minimize(optimization_problem, optimization_algorithm, termination_criterion, callback=convergence_callback,
-               seed=prefs.parameters.parameters["SEED"], display=monitor.ConvergenceMonitor(), verbose=True)
+    # NOTE - The checkpoint callback also keeps the archive of the standard convergence callback.
+    convergence_callback = checkpoint.CheckpointCallback(
+        path=config["checkpoint_path"],
+        log_writer=log_writer.GenerationLogWriter(directory=config["log_directory"]),
+        pareto_archive=archive.ParetoArchive(),
+        indicator_tracker=indicators.IndicatorTracker(reference_set=config["reference_front"]))
+
+    resumed_algorithm = None
+    if config["resume"] and os.path.isfile(convergence_callback.path):
+        resumed_algorithm = checkpoint.load_checkpoint(convergence_callback.path)
+
+        # The problem and the callback of the interrupted run replace the new ones.
+        optimization_problem = resumed_algorithm.problem
+        convergence_callback = resumed_algorithm.callback
+
+    try:
+        if resumed_algorithm is not None:
+            # NOTE - Interrupted steady-state runs are resumed generationally, since the designs in flight are lost.
+            res = checkpoint.resume(resumed_algorithm)
+        elif config["steady_state"]:
+            res = steady_state.minimize(optimization_problem, optimization_algorithm, termination,
+                                        callback=convergence_callback, seed=config["seed"],
+                                        display=monitor.ConvergenceMonitor(), verbose=config["verbose"])
+        else:
+            res = minimize(optimization_problem, optimization_algorithm, termination,
+                           callback=convergence_callback, seed=config["seed"],
+                           display=monitor.ConvergenceMonitor(), verbose=config["verbose"])
+    except BaseException:
+        # NOTE - The result of a failed run is never analyzed, so its spill files are deleted right away.
+        convergence_callback.close()
+        raise
+    finally:
+        # Kill any simulations still running when the optimization terminates.
+        optimization_problem.shutdown()
+
+        convergence_callback.log_writer.close()
+
+    if config["verbose"]:
+        print("FAILED SIMULATIONS =\n" + "{}".format(len(optimization_problem.simulation_pool.scheduler.failures)))
+        print("SIMULATION CACHE =\n" + "{}".format(optimization_problem.result_cache.statistics()))
+        if hasattr(res, "utilization"):
+            print("WORKER UTILIZATION =\n" + "{:.2%}".format(res.utilization))
+    optimization_problem.result_cache.close()
+
+    return res
+
+
+# NOTE - The optimization must only run when this module is executed directly.
+if __name__ == "__main__":
+    def parse_arguments() -> dict:
+        """Parse the command line arguments, which override the default configuration of the run."""
+
+        import argparse
+
+        parser = argparse.ArgumentParser(description="Optimize the heating and cooling setpoint schedules of a "
+                                                     "building model for thermal comfort and energy consumption.")
+        parser.add_argument("--idf", default=DEFAULT_CONFIG["idf"])
+        parser.add_argument("--epw", default=DEFAULT_CONFIG["epw"])
+        parser.add_argument("--pop-size", type=int, default=DEFAULT_CONFIG["pop_size"])
+        parser.add_argument("--n-max-gen", type=int, default=DEFAULT_CONFIG["n_max_gen"])
+        parser.add_argument("--n-max-evals", type=int, default=DEFAULT_CONFIG["n_max_evals"])
+        parser.add_argument("--max-time", default=DEFAULT_CONFIG["max_time"], help="e.g. 12:00:00")
+        parser.add_argument("--n-workers", type=int, default=DEFAULT_CONFIG["n_workers"])
+        parser.add_argument("--encoding", choices=("hourly", "coarse", "block"), default=DEFAULT_CONFIG["encoding"])
+        parser.add_argument("--checkpoint-path", default=DEFAULT_CONFIG["checkpoint_path"])
+        parser.add_argument("--log-directory", default=DEFAULT_CONFIG["log_directory"])
+        parser.add_argument("--reference-front", default=DEFAULT_CONFIG["reference_front"],
+                            help="a .CSV file with owPPD and NSE columns")
+        parser.add_argument("--resume", action="store_true", default=DEFAULT_CONFIG["resume"])
+        parser.add_argument("--seed", type=int, default=DEFAULT_CONFIG["seed"])
+        parser.add_argument("--steady-state", action="store_true", default=DEFAULT_CONFIG["steady_state"])
+        parser.add_argument("--quiet", dest="verbose", action="store_false")
+
+        return vars(parser.parse_args())
+
+
+    res = run_optimization(parse_arguments())
+
+    # The results of the run are used by the remaining steps below.
+    optimization_problem = res.problem
+    convergence_callback = res.algorithm.callback
 
 
 # API USAGE EXAMPLE
@@ -190,6 +464,9 @@ def algorithm_performance(objective_space_results, reference_point=(1., 1.), ref
     # NOTE - The HYPERVOLUME (HV) performance indicator refers to the area enclosed by the non-dominated solution prefs
     #  and a reference point in the feasible region, which is taken to be as "bad" as possible [i.e. (1, 1) for the
     #  normalized solution prefs] and needs to be maximized.
+    # NOTE - The pymoo factory imports every operator and indicator of pymoo, so it is only imported when needed.
+    from pymoo.factory import get_performance_indicator
+
     hv = get_performance_indicator("hv", ref_point=np.array(reference_point)).do(normalized_objective_space_results)
 
     # COMPARISON TO A REFERENCE SET
@@ -217,7 +494,11 @@ def algorithm_performance(objective_space_results, reference_point=(1., 1.), ref
         """..."""
 
         # Sort the non-dominated solution prefs with respect to its X-axis coordinates.
-        _sorted_objective_space_results = _objective_space_results[_objective_space_results[:, 0].argsort()]
+        # NOTE - Pareto archives are already sorted.
+        if isinstance(_objective_space_results, archive.ParetoArchive):
+            _sorted_objective_space_results = _objective_space_results.F
+        else:
+            _sorted_objective_space_results = _objective_space_results[_objective_space_results[:, 0].argsort()]
 
         # Compute the lower and upper bounds of the non-dominated solution prefs.
         _lower_bound = _sorted_objective_space_results[0, :]
@@ -266,7 +547,9 @@ def algorithm_performance(objective_space_results, reference_point=(1., 1.), ref
 
 # API USAGE EXAMPLE
 if __name__ == "__main__":
-    non_dominated_solutions = res.F
+    # NOTE - The Pareto archive holds the best front found across the whole run, rather than only the survivors of
+    #  the last generation.
+    non_dominated_solutions = convergence_callback.pareto_archive
 
     # NOTE - THE ASSERTION ABOVE HAS RUINED A 2 HOUR RUN FOR NO REASON.
     # kpis = assess_optimization_algorithm_performance(non_dominated_solutions)
@@ -316,6 +599,8 @@ def recommend_point(objective_space_results, max_ppd=10.0):
         weights = np.array([1, 1])
         # Since the range of F is normalized to [0, 1], the default values, which result in the corresponding utopian
         # point being placed at the origin, are OK and we don't need to calculate it ourselves.
+        from pymoo.factory import get_decomposition
+
         return get_decomposition("asf").do(normalized_objective_space_results, weights).argmin()
     return np.ma.masked_array(diff, mask).argmax()
 
@@ -343,7 +628,8 @@ def recommend_schedule(design_space_results, index):
 
 # API USAGE EXAMPLE
 if __name__ == "__main__":
-    design_space_results = recommend_schedule(res.X, I0)
+    # NOTE - The archived designs are decoded to the hourly setpoints of the sim model.
+    design_space_results = optimization_problem.encoding.decode(recommend_schedule(non_dominated_solutions.X, I0))[0]
     print("OPTIMAL POINT - DESIGN SPACE =\n" + "{}".format(design_space_results))
 
 
@@ -355,6 +641,8 @@ if __name__ == "__main__":
 
 def calculate_high_tradeoff_area(objective_space_results):
     """Calculate the high-tradeoff area of the Pareto Frontier"""
+    from pymoo.factory import get_decision_making
+
     return get_decision_making("high-tradeoff").do(objective_space_results)
 
 
@@ -375,6 +663,8 @@ if __name__ == "__main__":
 def write_logs(callback, decimals=prefs.parameters.parameters["OUTPUT_DECIMALS"], paths=None):
     """
     Write the objective and design space out for each generation to a CSV file for further manipulation.
+
+    NOTE - The same out is streamed in long format while the opt is running by log_writer.GenerationLogWriter.
     """
 
     # NOTE - This avoids a mutable default argument.
@@ -383,26 +673,30 @@ def write_logs(callback, decimals=prefs.parameters.parameters["OUTPUT_DECIMALS"]
                  "X": "../database/opt/logs/design_space.csv"
                  }
 
-    # Instantiate two dataframes to store the design and objective space out per population generation.
-    dataframe_F = pd.DataFrame()
-    dataframe_X = pd.DataFrame()
+    # NOTE - Each generation is built as a separate block of columns, which are then joined at once, since inserting
+    #  the columns one at a time would fragment the dataframes.
+    blocks_F = []
+    blocks_X = []
 
     for i in range(len(callback.F)):
-        # Add the design space out.
-        # NOTE - That the index column represents each objective function evaluation.
-        dataframe_F["Generation" + " " + str(i) + ": " + "owPPD"] = np.round(callback.F[i][:, 0], decimals)
-        dataframe_F["Generation" + " " + str(i) + ": " + "NSE"] = np.round(callback.F[i][:, 1], decimals)
-
         # Add the objective space out.
         # NOTE - That the index column represents each objective function evaluation.
-        for _i in range(len(callback.X[i][0,
-                            :])):  # The first row of res.X MUST have the same number of columns as the rest of the rows. # NOTE - This means that each population generation must be of the same size.
-            dataframe_X["Generation" + " " + str(i) + ": " + "X" + str(_i)] = np.round(callback.X[i][:, _i], decimals)
+        blocks_F.append(pd.DataFrame(np.round(callback.F[i][:, :2], decimals),
+                                     columns=["Generation" + " " + str(i) + ": " + label
+                                              for label in ("owPPD", "NSE")]))
+
+        # Add the design space out.
+        # NOTE - Each population generation must be of the same size.
+        blocks_X.append(pd.DataFrame(np.round(callback.X[i], decimals),
+                                     columns=["Generation" + " " + str(i) + ": " + "X" + str(_i)
+                                              for _i in range(callback.X[i].shape[1])]))
+
+    dataframe_F = pd.concat(blocks_F, axis=1) if blocks_F else pd.DataFrame()
+    dataframe_X = pd.concat(blocks_X, axis=1) if blocks_X else pd.DataFrame()
 
     # Write the required dataframes to CSV files.
-    # TODO - Find a better way to write this.
-    utils.librarian.create_directories(os.path.split(paths["F"])[0])
-    utils.librarian.create_directories(os.path.split(paths["X"])[0])
+    utils.file_manager.create_directories(os.path.split(paths["F"])[0])
+    utils.file_manager.create_directories(os.path.split(paths["X"])[0])
 
     dataframe_F.to_csv(paths["F"], index_label="Evaluation")
     dataframe_X.to_csv(paths["X"], index_label="Evaluation")
@@ -460,6 +754,9 @@ def write_result(design_space_result, lookup_table, decimals=prefs.parameters.pa
 if __name__ == "__main__":
     write_logs(convergence_callback)
 
+    # The spill files of the history are only deleted once the logs have been written.
+    convergence_callback.close()
+
     supplemental_data = [[00, 24, "Heating Setpoint (°C)"],
                          [24, 48, "Cooling Setpoint (°C)"]
                          ]
@@ -478,6 +775,9 @@ if __name__ == "__main__":
 def instantiate_figure(figure_dimensions=(10, 10), axis_labels=(
 "Fanger's Thermal Comfort Model: Occupancy-Weighted PPD (%)", "Net Site Energy Consumption (kWh)",
 "Global Warming Potential (kg $\mathregular{CO_2eq}$)")):
+    # NOTE - Matplotlib is only imported when a figure is drawn, so that the optimization itself starts faster.
+    import matplotlib.pyplot as plt
+
     figure, main_axes = plt.subplots(constrained_layout=True, figsize=figure_dimensions)  # (W, H) in 10**2 pixels.
 
     main_axes.set_xlabel(axis_labels[0])
@@ -537,6 +837,8 @@ def setup_axes(axes_object, axes_name, num_ticks, optimal_point,
                ):
     """Format the Pareto Front axis ticks."""
 
+    from matplotlib.ticker import FormatStrFormatter
+
     SETTINGS = {
         "x": (axes_object.get_xlim,
               axes_object.set_xticks,
@@ -662,6 +964,8 @@ def draw_high_tradeoff_area(figure_object, main_axes_object, high_tradeoff_area,
                         _rectangle_fill=rectangle_fill, _rectangle_fill_color=rectangle_fill_color,
                         _rectangle_stroke_color=rectangle_stroke_color, _rectangle_stroke_weight=rectangle_stroke_weight
                         ):
+        import matplotlib.patches as mpatches
+
         if _rectangle_stroke_weight is None:
             _rectangle_stroke_weight = 0.0015
         _rectangle_stroke_weight *= max(_figure_object.get_size_inches()) * _figure_object.dpi
@@ -724,6 +1028,8 @@ if __name__ == "__main__":
 
 def finalize_figure(main_axes_object, grid_linestyle="--", color=prefs.colors.colors["GRAY"],
                     path="../database/opt/out/pareto.png", dpi=300):
+    import matplotlib.pyplot as plt
+
     main_axes_object.grid(ls=grid_linestyle, c=color)
 
     main_axes_object.legend()
@@ -15,11 +15,16 @@
 #          You should have received a copy of the GNU General Public License
 #          along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import math
 import time
 
+import numpy as np
+
 from pymoo.core.termination import Termination
 from pymoo.util.misc import time_to_int
 
+from prefs.parameters import parameters
+
 
 class MaxWallTime(Termination):
 
@@ -44,3 +49,113 @@ class MaxWallTime(Termination):
         self.now = time.time()
         return self.now - self.start < self.max_time
 
+
+
+class SimulationBudget(MaxWallTime):
+    """Stop before the next generation would overshoot the maximum runtime, based on the measured runtime of each
+    simulation, or shrink the final generation so that it still fits."""
+
+    def __init__(self, max_time, percentile=parameters["BUDGET_PERCENTILE"],
+                 min_batch=parameters["BUDGET_MIN_BATCH"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        max_time: int, float or str
+            The maximum runtime of the optimization.
+
+        percentile: float
+            The percentile of the measured runtime per simulation, which is used to predict the runtime of the next
+            generation. Higher values leave a wider safety margin.
+
+        min_batch: int
+            The smallest number of designs worth simulating in a shrunk final generation.
+        """
+
+        super().__init__(max_time)
+        self.percentile = percentile
+        self.min_batch = min_batch
+
+        # The wall time per evaluation measured over each generation, which is only used for problems that do not run
+        # their simulations through a sim.scheduler.JobScheduler.
+        self.costs = []
+
+        self.last_time = None
+        self.last_n_eval = 0
+
+        # The name and original value of the attribute of the algorithm, which was shrunk for the final generation.
+        self.shrunk = None
+
+    @staticmethod
+    def _scheduler(algorithm):
+        """Return the scheduler running the simulations of the problem, or None if it has none."""
+
+        pool = getattr(algorithm.problem, "simulation_pool", None)
+
+        return getattr(pool, "scheduler", None)
+
+    def _costs(self, algorithm) -> np.ndarray:
+        """Return the measured cost of each simulation, or of each evaluation if the simulations are not scheduled."""
+
+        scheduler = self._scheduler(algorithm)
+        if scheduler is None:
+            return np.asarray(self.costs, dtype=float)
+
+        return np.asarray([end - start for start, end in scheduler.runtimes], dtype=float)
+
+    def cost(self, algorithm) -> tuple:
+        """Return the mean and upper percentile of the measured cost per simulation in seconds."""
+
+        costs = self._costs(algorithm)
+        if costs.size == 0:
+            return np.nan, np.nan
+
+        return float(np.mean(costs)), float(np.percentile(costs, self.percentile))
+
+    def do_continue(self, algorithm):
+        if not super().do_continue(algorithm):
+            return False
+
+        if self.last_time is None:
+            self.last_time = self.start
+
+        # NOTE - Without a scheduler, the cost is measured between generation boundaries, so that it is a
+        #  per-generation estimate, which also accounts for cache hits, failed simulations and the overhead of the
+        #  algorithm itself.
+        n_eval = algorithm.evaluator.n_eval
+        if n_eval > self.last_n_eval:
+            self.costs.append((self.now - self.last_time) / (n_eval - self.last_n_eval))
+        self.last_time, self.last_n_eval = self.now, n_eval
+
+        # The final generation has already been shrunk to fit the remaining budget.
+        if self.shrunk is not None:
+            setattr(algorithm, *self.shrunk)
+            return False
+
+        cost = self.cost(algorithm)[1]
+        if np.isnan(cost):
+            return True
+
+        # NOTE - The surrogate-assisted algorithm only simulates its infill designs after its warm-up generations.
+        if hasattr(algorithm, "n_infill") and algorithm.n_gen > algorithm.n_warmup:
+            attribute = "n_infill"
+        else:
+            attribute = "n_offsprings"
+        n_simulated = getattr(algorithm, attribute)
+
+        # NOTE - The scheduled simulations run in waves of as many simulations as there are workers.
+        scheduler = self._scheduler(algorithm)
+        n_workers = scheduler.max_jobs if scheduler is not None else 1
+
+        remaining = self.max_time - (self.now - self.start)
+        n_affordable = math.floor(remaining / cost) * n_workers
+
+        if n_affordable >= n_simulated:
+            return True
+        elif n_affordable >= self.min_batch:
+            self.shrunk = (attribute, n_simulated)
+            setattr(algorithm, attribute, n_affordable)
+            return True
+        else:
+            return False
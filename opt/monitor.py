@@ -56,4 +56,14 @@ class ConvergenceMonitor(Display):
         else:
             output_str = "N/A"
 
-        self.output.append("Termination Metric", output_str)
\ No newline at end of file
+        self.output.append("Termination Metric", output_str)
+
+        # Report the accuracy of the surrogate, if there is one, against the offspring evaluated by simulation.
+        if hasattr(algorithm, "surrogate_accuracy"):
+            if algorithm.predictions is not None and algorithm.surrogate_accuracy:
+                output_str = self.output.format_float(np.nanmean(algorithm.surrogate_accuracy[-1]["r2"]),
+                                                      self.output.default_width)
+            else:
+                output_str = "N/A"
+
+            self.output.append("Surrogate R2", output_str)
\ No newline at end of file
@@ -56,7 +56,7 @@ class RollingWindow(TerminationCollection):
 
         super().__init__(MaximumGenerationTermination(n_max_gen=n_max_gen),
                          MaximumFunctionCallTermination(n_max_evals=n_max_evals),
-                         max_wall_time.MaxWallTime(max_time=max_time))
+                         max_wall_time.SimulationBudget(max_time=max_time))
 
         # the window sizes stored in objects
         self.data_window_size = data_window_size
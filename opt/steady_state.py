@@ -0,0 +1,215 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import concurrent.futures
+import time
+
+import numpy as np
+
+from pymoo.core.evaluator import set_feasibility
+from pymoo.core.population import Population
+from pymoo.core.problem import calc_constr
+
+from prefs.parameters import parameters
+
+import surrogate
+
+
+def _resolved(f) -> concurrent.futures.Future:
+    """Return a future, which already holds the objectives of a design."""
+
+    future = concurrent.futures.Future()
+    future.set_result(f)
+
+    return future
+
+
+def _submit(problem, off) -> list:
+    """
+    Start the evaluation of each offspring and return a (future, constraints, cache key) job for each one. The futures
+    of infeasible and cached designs are resolved right away, and their cache key is None.
+    """
+
+    # NOTE - This mirrors the batch evaluation of main.OptimizationProblem, one design at a time.
+    schedules = problem.encoding.decode(off.get("X"))
+    G = problem.constraints.evaluate(schedules)
+
+    feasible = np.flatnonzero(np.all(G <= 0, axis=1))
+    keys = problem.result_cache.keys(schedules[feasible])
+    cached = dict(zip(feasible, zip(keys, problem.result_cache.get(keys))))
+
+    jobs = []
+    for i in range(len(off)):
+        if i not in cached:
+            jobs.append((_resolved(parameters["SIMULATION_PENALTY"]), G[i], None))
+        elif cached[i][1] is not None:
+            jobs.append((_resolved(cached[i][1]), G[i], None))
+        else:
+            jobs.append((problem.simulation_pool.submit(schedules[i]), G[i], cached[i][0]))
+
+    return jobs
+
+
+def _collect(problem, future, individual, g, key):
+    """Assign the arrived objectives of an offspring to it, and cache them unless its simulation failed."""
+
+    f = future.result()
+
+    # NOTE - The penalized objectives of failed simulations are not cached, so that they can be retried later.
+    if f is not problem.simulation_pool.scheduler.penalty and key is not None:
+        problem.result_cache.put([key], [f])
+
+    G = np.atleast_2d(g)
+    individual.set("F", np.asarray(f, dtype=float))
+    individual.set("G", G[0])
+    individual.set("CV", calc_constr(G)[0])
+    individual.set("fidelity", "full" if np.all(G <= 0) else "none")
+
+    return individual
+
+
+def _ask(algorithm, n_offsprings: int):
+    """Ask the algorithm for a given number of offspring, mated from its current population."""
+
+    generation_size = algorithm.n_offsprings
+
+    algorithm.n_offsprings = n_offsprings
+    try:
+        return algorithm.ask()
+    finally:
+        algorithm.n_offsprings = generation_size
+
+
+def _advance(algorithm, infills) -> None:
+    """
+    Complete a generation of offspring, which have already been inserted into the population one by one, exactly like
+    pymoo.core.algorithm.Algorithm.advance completes a generation after its survival.
+    """
+
+    algorithm.off = infills
+    algorithm.n_gen += 1
+
+    algorithm._post_advance()
+
+    algorithm.has_terminated = not algorithm.termination.do_continue(algorithm)
+    if algorithm.has_terminated:
+        algorithm.finalize()
+
+
+def minimize(problem, algorithm, termination, callback=None, display=None, seed=None, verbose=False,
+             n_in_flight=parameters["STEADY_STATE_IN_FLIGHT"]):
+    """
+    Optimize a problem like pymoo.optimize.minimize does, but keep a fixed number of simulations in flight at all
+    times, insert each result into the population as soon as it arrives, and mate new offspring right away.
+
+    The callback, the display and the termination criterion are notified once every n_offsprings arrivals, so that
+    their generation-based settings keep their meaning. The result also holds the utilization of the workers, i.e. the
+    fraction of their time spent running simulations.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    problem: main.OptimizationProblem
+        The problem, whose simulation pool, cache and constraints evaluate each offspring.
+
+    algorithm: pymoo.algorithms.moo.nsga2.NSGA2
+        The algorithm, whose ask and tell interface generates and inserts the offspring.
+
+    n_in_flight: int
+        The number of offspring evaluated at any time. If None, it is equal to the number of workers.
+    """
+
+    if getattr(problem, "screening", False):
+        raise ValueError("The steady-state optimization does not support screening simulations.")
+    # NOTE - The surrogate is trained while advancing whole generations, which never happens here.
+    if isinstance(algorithm, surrogate.SurrogateAssistedNSGA2):
+        raise ValueError("The steady-state optimization does not support the surrogate-assisted algorithm.")
+
+    algorithm.setup(problem, termination=termination, callback=callback, display=display, seed=seed, verbose=verbose)
+
+    # NOTE - Offspring can only be mated from an evaluated population, so the initial one is evaluated as a whole.
+    infills = algorithm.ask()
+    algorithm.evaluator.eval(problem, infills, algorithm=algorithm)
+    algorithm.tell(infills=infills)
+
+    scheduler = problem.simulation_pool.scheduler
+    if n_in_flight is None:
+        n_in_flight = scheduler.max_jobs
+
+    # NOTE - The designs in flight are archived as soon as they are submitted, so that they are not mated again.
+    design_archive = getattr(algorithm.eliminate_duplicates, "design_archive", None)
+
+    in_flight = {}
+    arrived = []
+
+    # NOTE - The utilization is measured from the run times of the simulations recorded by the scheduler, starting
+    #  after the initial population has been evaluated.
+    start = time.time()
+    try:
+        while True:
+            while not algorithm.has_terminated and len(in_flight) < n_in_flight:
+                off = _ask(algorithm, n_in_flight - len(in_flight))
+
+                # NOTE - The mating may fail to produce any new offspring, in which case the run ends once the designs
+                #  in flight have arrived.
+                if off is None or not len(off):
+                    break
+
+                if design_archive is not None:
+                    design_archive.add(off.get("X"))
+
+                for individual, (future, g, key) in zip(off, _submit(problem, off)):
+                    in_flight[future] = (individual, g, key)
+
+            if not in_flight:
+                break
+
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            infills = Population.create(*[_collect(problem, future, *in_flight.pop(future)) for future in done])
+            set_feasibility(infills)
+            algorithm.evaluator.n_eval += len(infills)
+
+            # The arrived offspring compete with the current population right away.
+            algorithm.pop = algorithm.survival.do(problem, Population.merge(algorithm.pop, infills),
+                                                  n_survive=algorithm.pop_size, algorithm=algorithm)
+
+            arrived.append(infills)
+            if sum(len(infills) for infills in arrived) >= algorithm.n_offsprings:
+                _advance(algorithm, Population.merge(*arrived))
+                arrived = []
+
+            if algorithm.has_terminated:
+                break
+    finally:
+        end = time.time()
+
+        # Kill the remaining simulations when the optimization terminates or is interrupted.
+        for future in in_flight:
+            future.cancel()
+
+    if arrived:
+        _advance(algorithm, Population.merge(*arrived))
+    if not algorithm.has_terminated:
+        algorithm.finalize()
+
+    res = algorithm.result()
+    res.algorithm = algorithm
+    res.utilization = scheduler.utilization(start, end)
+
+    return res
@@ -0,0 +1,308 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import numpy as np
+
+from pymoo.algorithms.moo.nsga2 import NSGA2, RankAndCrowdingSurvival
+from pymoo.core.population import Population
+
+from prefs.parameters import parameters
+
+import utils.optimization
+
+
+class Surrogate:
+    """Approximate the objectives of the sim problem, along with their uncertainty, by regression over the designs
+    evaluated so far."""
+
+    def __init__(self, model=parameters["SURROGATE_MODEL"], xl=None, xu=None, max_samples=1000,
+                 n_neighbors=8) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        model: str
+            The regression model, which is either "gp" for Gaussian process regression or "rf" for random forest
+            regression, both of which require scikit-learn, or "knn" for nearest neighbor regression.
+
+        xl: numpy.ndarray
+            The lower bounds of the design space, which are used to scale the design vectors.
+
+        xu: numpy.ndarray
+            The upper bounds of the design space, which are used to scale the design vectors.
+
+        max_samples: int
+            The maximum number of the most recently evaluated designs used for training.
+            NOTE - The training time of Gaussian process regression grows cubically with the number of samples.
+
+        n_neighbors: int
+            The number of neighbors used by nearest neighbor regression.
+        """
+
+        if model not in ("gp", "rf", "knn"):
+            raise ValueError('Model must be set to either "gp", "rf" or "knn".')
+
+        self.model = model
+        self.xl = xl
+        self.xu = xu
+        self.max_samples = max_samples
+        self.n_neighbors = n_neighbors
+
+        self.regressors = None
+        self.X = None
+        self.F = None
+
+    def _scale(self, X) -> np.ndarray:
+        if self.xl is None or self.xu is None:
+            return X
+
+        return (X - self.xl) / (self.xu - self.xl)
+
+    def fit(self, X, F) -> None:
+        """Train the surrogate on a set of designs and their objectives."""
+
+        X = self._scale(np.asarray(X, dtype=float))[-self.max_samples:]
+        F = np.asarray(F, dtype=float)[-self.max_samples:]
+
+        if self.model == "gp":
+            try:
+                from sklearn.gaussian_process import GaussianProcessRegressor
+                from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+            except ImportError as error:
+                raise ImportError("Gaussian process surrogates require scikit-learn.") from error
+
+            self.regressors = []
+            for i in range(F.shape[1]):
+                # NOTE - Each variable has its own length scale, since the setpoints of some hours matter more.
+                kernel = ConstantKernel() * Matern(length_scale=np.ones(X.shape[1]), nu=2.5) + WhiteKernel(1E-3)
+
+                regressor = GaussianProcessRegressor(kernel=kernel, normalize_y=True, n_restarts_optimizer=2,
+                                                     random_state=parameters["SEED"])
+                self.regressors.append(regressor.fit(X, F[:, i]))
+        elif self.model == "rf":
+            try:
+                from sklearn.ensemble import RandomForestRegressor
+            except ImportError as error:
+                raise ImportError("Random forest surrogates require scikit-learn.") from error
+
+            self.regressors = [RandomForestRegressor(n_estimators=100, min_samples_leaf=2, n_jobs=-1,
+                                                     random_state=parameters["SEED"]).fit(X, F)]
+        else:
+            self.X = X
+            self.F = F
+
+    def predict(self, X) -> tuple:
+        """Return the predicted objectives of a set of designs, along with their standard deviations."""
+
+        X = self._scale(np.asarray(X, dtype=float))
+
+        if self.model == "gp":
+            predictions = [regressor.predict(X, return_std=True) for regressor in self.regressors]
+
+            return np.column_stack([p[0] for p in predictions]), np.column_stack([p[1] for p in predictions])
+        elif self.model == "rf":
+            # The uncertainty of a random forest is estimated by the disagreement between its trees.
+            predictions = np.array([tree.predict(X) for tree in self.regressors[0].estimators_])
+            if predictions.ndim == 2:
+                predictions = predictions[:, :, None]
+
+            return predictions.mean(axis=0), predictions.std(axis=0)
+        else:
+            distances = np.linalg.norm(X[:, None, :] - self.X[None, :, :], axis=2)
+
+            k = min(self.n_neighbors, len(self.X))
+            neighbors = np.argpartition(distances, k - 1, axis=1)[:, :k]
+
+            weights = 1 / np.maximum(np.take_along_axis(distances, neighbors, axis=1), 1E-12)
+            weights /= weights.sum(axis=1, keepdims=True)
+
+            F = self.F[neighbors]
+            mean = np.einsum("ij,ijk->ik", weights, F)
+            std = np.sqrt(np.einsum("ij,ijk->ik", weights, (F - mean[:, None, :]) ** 2))
+
+            return mean, std
+
+
+def select_infill(mean, std, n_infill: int, criterion="lcb", kappa=1., exploration=0.) -> np.ndarray:
+    """
+    Select the candidate designs which should be evaluated by simulation according to their predicted objectives.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    criterion: str
+        The infill criterion, which is either "mean" for the most promising predicted objectives, "lcb" for the most
+        promising lower confidence bounds of the objectives or "uncertainty" for the most uncertain predictions.
+
+    kappa: float
+        The number of standard deviations subtracted from the predicted objectives by the "lcb" criterion.
+
+    exploration: float
+        The fraction of the selected designs, which are chosen by the "uncertainty" criterion regardless of the given
+        one.
+    """
+
+    if criterion not in ("mean", "lcb", "uncertainty"):
+        raise ValueError('Criterion must be set to either "mean", "lcb" or "uncertainty".')
+
+    n_infill = min(n_infill, len(mean))
+
+    # NOTE - The uncertainty of each objective is measured relative to its predicted range.
+    scale = np.ptp(mean, axis=0)
+    scale[scale == 0] = 1
+    uncertainty = (std / scale).sum(axis=1)
+
+    n_explore = n_infill if criterion == "uncertainty" else int(round(exploration * n_infill))
+
+    selected = list(np.argsort(-uncertainty)[:n_explore])
+    remaining = np.setdiff1d(np.arange(len(mean)), selected)
+
+    if n_infill > n_explore:
+        F = mean[remaining] if criterion == "mean" else mean[remaining] - kappa * std[remaining]
+
+        # The most promising designs are those which survive a rank and crowding selection on the predictions.
+        survival = RankAndCrowdingSurvival()
+        survival.filter_infeasible = False
+        survivors = survival.do(None, Population.new("F", F), n_survive=n_infill - n_explore, return_indices=True)
+
+        selected += list(remaining[survivors])
+
+    return np.array(selected, dtype=int)
+
+
+class SurrogateAssistedNSGA2(NSGA2):
+    """Pre-screen a large pool of offspring with a surrogate, so that only the most promising or uncertain ones are
+    evaluated by simulation."""
+
+    def __init__(self, surrogate=None, n_infill=parameters["SURROGATE_INFILL_SIZE"],
+                 n_candidates=parameters["SURROGATE_CANDIDATES"], criterion=parameters["SURROGATE_CRITERION"],
+                 kappa=1., exploration=parameters["SURROGATE_EXPLORATION"],
+                 retrain_period=parameters["SURROGATE_RETRAIN_PERIOD"], n_warmup=1, **kwargs) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        surrogate: Surrogate
+            The surrogate. If None, one is created using the bounds of the sim problem.
+
+        n_infill: int
+            The number of designs evaluated by simulation during each generation.
+
+        n_candidates: int
+            The number of offspring pre-screened by the surrogate during each generation.
+
+        retrain_period: int
+            The number of generations between two consecutive trainings of the surrogate.
+
+        n_warmup: int
+            The number of generations, during which all offspring are evaluated by simulation to train the surrogate.
+
+        NOTE - The surrogate is trained on the archive of the callback passed to pymoo.optimize.minimize, which must be
+         an opt.callback.ConvergenceCallback.
+        """
+
+        super().__init__(**kwargs)
+
+        self.surrogate = surrogate
+        self.n_infill = n_infill
+        self.n_candidates = n_candidates
+        self.criterion = criterion
+        self.kappa = kappa
+        self.exploration = exploration
+        self.retrain_period = retrain_period
+        self.n_warmup = n_warmup
+
+        self.last_training = None
+
+        # The predictions of the current offspring, along with the accuracy of the surrogate during each generation.
+        self.predictions = None
+        self.surrogate_accuracy = []
+
+    def _setup(self, problem, **kwargs):
+        super()._setup(problem, **kwargs)
+
+        if self.surrogate is None:
+            self.surrogate = Surrogate(xl=problem.xl, xu=problem.xu)
+
+    def _train(self) -> bool:
+        """Train the surrogate on every design evaluated so far, unless it has been trained recently enough."""
+
+        if self.last_training is not None and self.n_gen - self.last_training < self.retrain_period:
+            return True
+
+        if not hasattr(self.callback, "archive"):
+            raise ValueError("The callback must keep an archive of the evaluated designs.")
+
+        X, F = self.callback.archive()
+        if len(X) < 2 * self.problem.n_var:
+            return False
+
+        # The penalized objectives of failed simulations would mislead the surrogate.
+        valid = ~np.all(F == np.asarray(parameters["SIMULATION_PENALTY"], dtype=float), axis=1)
+        X, F = X[valid], F[valid]
+
+        # NOTE - Designs which are equal after rounding are only used once.
+        _, indices = np.unique(utils.optimization.quantize(X, parameters["SAMPLING_DECIMALS"]), axis=0,
+                               return_index=True)
+        indices = np.sort(indices)
+        if len(indices) < 2 * self.problem.n_var:
+            return False
+
+        self.surrogate.fit(X[indices], F[indices])
+        self.last_training = self.n_gen
+
+        return True
+
+    def _infill(self):
+        self.predictions = None
+
+        if self.n_gen <= self.n_warmup or not self._train():
+            return super()._infill()
+
+        candidates = self.mating.do(self.problem, self.pop, self.n_candidates, algorithm=self)
+        if len(candidates) == 0:
+            self.termination.force_termination = True
+            return
+
+        mean, std = self.surrogate.predict(candidates.get("X"))
+        selected = select_infill(mean, std, self.n_infill, self.criterion, self.kappa, self.exploration)
+
+        self.predictions = mean[selected]
+
+        return candidates[selected]
+
+    def _advance(self, infills=None, **kwargs):
+        if self.predictions is not None and infills is not None:
+            self.surrogate_accuracy.append(surrogate_accuracy(infills.get("F"), self.predictions))
+
+        super()._advance(infills=infills, **kwargs)
+
+
+def surrogate_accuracy(F, predictions) -> dict:
+    """Measure the accuracy of the predicted objectives of a set of designs against their true objectives."""
+
+    residuals = F - predictions
+
+    total = ((F - F.mean(axis=0)) ** 2).sum(axis=0)
+    total[total == 0] = np.nan
+
+    return {"rmse": np.sqrt((residuals ** 2).mean(axis=0)),
+            "r2": 1 - (residuals ** 2).sum(axis=0) / total}
@@ -17,8 +17,14 @@
 
 import numpy as np
 
+from pymoo.util.termination.collection import TerminationCollection
+
+import archive
+import indicators
 import rolling_window
 
+from prefs.parameters import parameters
+
 
 class TerminationCriterion(rolling_window.RollingWindow):
 
@@ -58,3 +64,115 @@ class TerminationCriterion(rolling_window.RollingWindow):
             raise NameError("The termination criterion mode must be set to either soft, medium, or hard.")
 
         return comparison_argument > self.tol
+
+
+class HypervolumeCriterion(rolling_window.RollingWindow):
+    """Terminate once the relative improvement of the hypervolume of every solution evaluated so far stagnates."""
+
+    def __init__(self, n_last=10, tol=1E-3, reference_point=parameters["HV_REFERENCE_POINT"], n_max_gen=None,
+                 n_max_evals=None, max_time=None) -> None:
+        super().__init__(metric_window_size=n_last,
+                         n_max_gen=n_max_gen,
+                         n_max_evals=n_max_evals,
+                         max_time=max_time)
+        self.tol = tol
+
+        # NOTE - The hypervolume is maintained incrementally as the offspring of each generation enter the archive.
+        self.pareto_archive = archive.ParetoArchive()
+        self.indicator_tracker = indicators.IndicatorTracker(reference_point=reference_point, reference_set=None)
+
+    def _store(self, algorithm):
+        if algorithm.off is not None and len(algorithm.off):
+            self.pareto_archive.update(algorithm.off.get("F"))
+
+        return self.indicator_tracker.update(algorithm.n_gen, self.pareto_archive)["Hypervolume"]
+
+    def _metric(self, data):
+        if not data[-2] > 0:
+            return None
+
+        return (data[-1] - data[-2]) / data[-2]
+
+    def _decide(self, metrics):
+        return np.max(metrics) > self.tol
+
+
+class IdealNadirCriterion(rolling_window.RollingWindow):
+    """Terminate once the ideal and nadir points of the non-dominated front stop drifting."""
+
+    def __init__(self, n_last=10, tol=1E-3, n_max_gen=None, n_max_evals=None, max_time=None) -> None:
+        super().__init__(metric_window_size=n_last,
+                         n_max_gen=n_max_gen,
+                         n_max_evals=n_max_evals,
+                         max_time=max_time)
+        self.tol = tol
+
+    def _store(self, algorithm):
+        F = algorithm.opt.get("F")
+        return F.min(axis=0), F.max(axis=0)
+
+    def _metric(self, data):
+        (previous_ideal, previous_nadir), (ideal, nadir) = data[-2], data[-1]
+
+        # NOTE - The drift is normalized by the current extent of the front, so that both objectives weigh the same
+        #  regardless of their units.
+        extent = np.where(nadir > ideal, nadir - ideal, 1.)
+
+        return max(np.max(np.abs(ideal - previous_ideal) / extent), np.max(np.abs(nadir - previous_nadir) / extent))
+
+    def _decide(self, metrics):
+        return np.max(metrics) > self.tol
+
+
+class IGDCriterion(rolling_window.RollingWindow):
+    """Terminate once the inverted generational distance between the fronts of consecutive generations vanishes."""
+
+    def __init__(self, n_last=10, tol=1E-3, n_max_gen=None, n_max_evals=None, max_time=None) -> None:
+        super().__init__(metric_window_size=n_last,
+                         n_max_gen=n_max_gen,
+                         n_max_evals=n_max_evals,
+                         max_time=max_time)
+        self.tol = tol
+
+    def _store(self, algorithm):
+        return algorithm.opt.get("F")
+
+    def _metric(self, data):
+        previous_front, front = data[-2], data[-1]
+
+        # NOTE - Both fronts are normalized by the extent of the current one, which also serves as the reference set.
+        ideal, nadir = front.min(axis=0), front.max(axis=0)
+        extent = np.where(nadir > ideal, nadir - ideal, 1.)
+
+        from pymoo.factory import get_performance_indicator
+
+        return get_performance_indicator("igd", (front - ideal) / extent).do((previous_front - ideal) / extent)
+
+    def _decide(self, metrics):
+        return np.max(metrics) > self.tol
+
+
+CRITERIA = {
+    "design_space": TerminationCriterion,
+    "hypervolume": HypervolumeCriterion,
+    "ideal_nadir": IdealNadirCriterion,
+    "igd": IGDCriterion
+}
+
+
+def get_termination_criterion(metrics=parameters["TERMINATION_METRICS"], n_max_gen=None, n_max_evals=None,
+                              max_time=None):
+    """Combine one or more termination criteria, so that the optimization stops as soon as any of them is met."""
+
+    if isinstance(metrics, str):
+        metrics = (metrics,)
+
+    for metric in metrics:
+        if metric not in CRITERIA:
+            raise NameError("The termination metric must be set to either {}.".format(", ".join(CRITERIA)))
+
+    criteria = [CRITERIA[metric](n_max_gen=n_max_gen, n_max_evals=n_max_evals, max_time=max_time)
+                for metric in metrics]
+
+    # NOTE - A collection continues only as long as all of its members do.
+    return criteria[0] if len(criteria) == 1 else TerminationCollection(*criteria)
@@ -46,6 +46,11 @@ parameters = {
     # NOTE - This value must be a positive integer.
     "SAMPLING_DECIMALS": 2,
 
+    # This setting controls the method used during the initial population sampling, i.e. lhs for a Latin hypercube,
+    # sobol for a scrambled Sobol sequence, or uniform.
+    # NOTE - This value must be either lhs, sobol, or uniform.
+    "SAMPLING_METHOD": "lhs",
+
     # This setting controls the seed of the RNG engine used during the sim process to ensure reproducible
     # results.
     # NOTE - This value must be a positive integer.
@@ -68,5 +73,216 @@ parameters = {
     # NOTE - This value must be less than or equal to the sim process time interval and such that it divides
     #  said interval exactly.
     "DF_FREQ_STR": "1H",
-    "DF_FREQ_NUM": 1
+    "DF_FREQ_NUM": 1,
+
+    # This setting controls the number of EnergyPlus™ simulations which are run concurrently during the evaluation of
+    # each population generation.
+    # NOTE - This value must be a positive integer or None, in which case all available logical cores are used.
+    "N_WORKERS": None,
+
+    # This setting controls the version of the EnergyPlus™ installation used to run the simulations.
+    # NOTE - This value must be given in the X-Y-Z format used by the EnergyPlus™ installation directories.
+    "EPLUS_VERSION": "9-0-1",
+
+    # This setting controls the EnergyPlus™ executable used to run the simulations.
+    # NOTE - This value must be a command line string (e.g. "python ../sim/stub_eplus.py") or None, in which case the
+    #  executable of the installation given by EPLUS_VERSION is used. Relative paths to existing files are resolved
+    #  against the working directory of the optimization, and the stub requires the root directory of the project to
+    #  be on the PYTHONPATH.
+    "EPLUS_EXECUTABLE": None,
+
+    # This setting controls the wall-clock time, in seconds, after which a simulation is considered hung and killed.
+    # NOTE - This value must be a positive real number or None, in which case simulations never time out.
+    "SIMULATION_TIMEOUT": 600,
+
+    # This setting controls the number of times a failed or hung simulation is retried before it is given up on.
+    # NOTE - This value must be a non-negative integer.
+    "SIMULATION_RETRIES": 2,
+
+    # This setting controls the objective values assigned to designs whose simulation could not be completed.
+    # NOTE - These values must be worse than those of any design which can be simulated, so that such designs are
+    #  eliminated by the survival selection process.
+    "SIMULATION_PENALTY": (100, 1E9),
+
+    # This setting controls the directory, inside which the run directory of each simulation is created.
+    # NOTE - This value should point to a RAM disk (i.e. a tmpfs) or be None, in which case /dev/shm is used if it is
+    #  available and the default temporary directory of the system otherwise.
+    "SCRATCH_DIRECTORY": None,
+
+    # This setting controls the result files which are copied back from the run directory of each simulation before
+    # it is deleted.
+    # NOTE - This value must be a tuple of file names (e.g. ("eplusout.err", "eplustbl.htm")), which may be empty.
+    #  The whole run directory of every failed simulation is always copied back.
+    "KEEP_OUTPUTS": (),
+
+    # This setting controls the maximum number of simulated designs kept inside the persistent result cache, beyond
+    # which the least recently used ones are evicted.
+    # NOTE - This value must be a positive integer or None, in which case the cache is unbounded.
+    "CACHE_SIZE": 100000,
+
+    # This setting controls the result files, from which the objectives of each simulation are read.
+    # NOTE - This value must be either "sql", in which case EnergyPlus™ writes an eplusout.SQL file and ReadVarsESO is
+    #  skipped, or "csv", in which case the eplusout.CSV and eplustbl.HTM files are read instead.
+    "READER_BACKEND": "sql",
+
+    # This setting controls whether the reports and output variables, which are not required to calculate the
+    # objectives, are removed from the model before it is simulated.
+    # NOTE - This value must be either True or False.
+    "TRIM_OUTPUTS": True,
+
+    # This setting controls whether the offspring of each generation are pre-screened by a surrogate, so that only a
+    # few of them are evaluated by simulation.
+    # NOTE - This value must be either True or False.
+    "SURROGATE_ASSISTED": False,
+
+    # This setting controls the regression model of the surrogate.
+    # NOTE - This value must be either "gp" (i.e. Gaussian process) or "rf" (i.e. random forest), both of which require
+    #  scikit-learn, or "knn" (i.e. nearest neighbors).
+    "SURROGATE_MODEL": "gp",
+
+    # This setting controls the number of offspring evaluated by simulation during each generation.
+    # NOTE - This value must be a positive integer.
+    "SURROGATE_INFILL_SIZE": 20,
+
+    # This setting controls the number of offspring pre-screened by the surrogate during each generation.
+    # NOTE - This value must be a positive integer, greater than SURROGATE_INFILL_SIZE.
+    "SURROGATE_CANDIDATES": 500,
+
+    # This setting controls how the offspring evaluated by simulation are chosen.
+    # NOTE - This value must be either "mean" (i.e. the most promising predictions), "lcb" (i.e. the most promising
+    #  lower confidence bounds of the predictions) or "uncertainty" (i.e. the most uncertain predictions).
+    "SURROGATE_CRITERION": "lcb",
+
+    # This setting controls the fraction of the offspring evaluated by simulation, which are chosen because their
+    # predictions are the most uncertain, regardless of SURROGATE_CRITERION.
+    # NOTE - This value must be a real number between 0.0 and 1.0.
+    "SURROGATE_EXPLORATION": 0.25,
+
+    # This setting controls the number of generations between two consecutive trainings of the surrogate.
+    # NOTE - This value must be a positive integer.
+    "SURROGATE_RETRAIN_PERIOD": 1,
+
+    # This setting controls the number of generations between two consecutive checkpoints of the optimization run.
+    # NOTE - This value must be a positive integer or None, in which case only CHECKPOINT_MINUTES is considered.
+    "CHECKPOINT_GENERATIONS": 5,
+
+    # This setting controls the number of minutes between two consecutive checkpoints of the optimization run.
+    # NOTE - This value must be a positive real number or None, in which case only CHECKPOINT_GENERATIONS is
+    #  considered.
+    "CHECKPOINT_MINUTES": 30,
+
+    # This setting controls whether the optimization run continues from its last checkpoint, if there is one.
+    # NOTE - This value must be either True or False.
+    "RESUME": False,
+
+    # This setting controls the format of the log files, to which each generation is streamed as soon as it completes.
+    # NOTE - This value must be either "csv", "arrow" (i.e. the Arrow IPC streaming format) or "parquet", the last two
+    #  of which require pyarrow.
+    "LOG_FORMAT": "csv",
+
+    # This setting controls the number of most recent generations, whose design and objective space are kept in
+    # memory during the optimization, while the older ones are spilled to disk.
+    # NOTE - This value must be a positive integer.
+    "HISTORY_GENERATIONS": 50,
+
+    # This setting controls the reference point of the hypervolume tracked after every generation, in the units of the
+    # objectives, i.e. (owPPD, NSE). If None, the nadir point of the first front is used, widened by 10%.
+    # NOTE - This value must be a tuple of two floats or None, and must be kept fixed when comparing runs.
+    "HV_REFERENCE_POINT": None,
+
+    # This setting controls the reference front of the IGD+ tracked after every generation, e.g. the pareto_front.csv
+    # file of a previous long run. If None, IGD+ is not tracked.
+    # NOTE - This value must be the path to a .CSV file with owPPD and NSE columns or None.
+    "IGD_REFERENCE_FRONT": None,
+
+    # This setting controls the criteria, any of which terminates the optimization once met. The design_space criterion
+    # watches the change of the design vectors, while the hypervolume, ideal_nadir and igd criteria watch the progress
+    # of the front in the objective space.
+    # NOTE - This value must be a tuple of design_space, hypervolume, ideal_nadir, and/or igd.
+    "TERMINATION_METRICS": ("design_space",),
+
+    # This setting controls the percentile of the measured runtime per simulation, which is used to predict whether the
+    # next generation still fits in the maximum runtime of the optimization.
+    # NOTE - This value must be a float between 0 and 100.
+    "BUDGET_PERCENTILE": 90,
+
+    # This setting controls the smallest number of designs worth simulating, when the final generation is shrunk to
+    # fit in the maximum runtime of the optimization. Otherwise, the optimization stops one generation early.
+    # NOTE - This value must be a positive integer.
+    "BUDGET_MIN_BATCH": 10,
+
+    # This setting controls whether the offspring equal to any design evaluated so far, when rounded to the sampling
+    # decimal places, are eliminated as duplicates, so that each generation only contains new designs.
+    # NOTE - This value must be a boolean.
+    "ELIMINATE_EVALUATED": True,
+
+    # This setting controls how the design vector maps to the 24 hourly heating and 24 hourly cooling setpoints, i.e.
+    # hourly for one variable per setpoint, coarse for one variable per DF_FREQ_NUM hours, or block for
+    # piecewise-constant setpoints over the blocks below.
+    # NOTE - This value must be either hourly, coarse, or block.
+    "ENCODING": "hourly",
+
+    # This setting controls the blocks of the block encoding, each of which is given by its name and its earliest and
+    # latest start hour. The hours before the start of the first block belong to the last one.
+    # NOTE - This value must be a tuple of (str, float, float) tuples in chronological order.
+    "SCHEDULE_BLOCKS": (("Morning", 4, 8), ("Day", 8, 12), ("Evening", 16, 20), ("Night", 20, 24)),
+
+    # This setting controls the minimum difference between the cooling and the heating setpoint of each hour, in °C.
+    # Designs which violate this or any of the following constraints are penalized without being simulated.
+    # NOTE - This value must be a non-negative float.
+    "SETPOINT_DEADBAND": 0.,
+
+    # This setting controls the maximum change of each setpoint from one hour to the next, in °C.
+    # NOTE - This value must be a positive float or None, in which case the ramp is not limited.
+    "SETPOINT_MAX_RAMP": None,
+
+    # This setting controls the lowest heating and the highest cooling setpoint of acceptable comfort, in °C.
+    # NOTE - This value must be a tuple of two floats or None, in which case the setpoints are only limited by the
+    #  variable bounds.
+    "COMFORT_BAND": None,
+
+    # This setting controls whether the sizes and external shading of the base model are calculated once and then
+    # hard-coded into every simulated model, instead of being recalculated by each simulation.
+    # NOTE - This value must be a boolean. The simulations are cold-started whenever the warm-started base model does
+    #  not reproduce its own objectives within WARM_START_TOLERANCE.
+    "WARM_START": False,
+
+    # This setting controls the minimum number of warmup days of each warm-started simulation.
+    # NOTE - This value must be a positive integer. Each simulation still warms up until it has converged.
+    "WARMUP_DAYS": 1,
+
+    # This setting controls the largest relative error of the warm-started objectives of the base model.
+    # NOTE - This value must be a non-negative float.
+    "WARM_START_TOLERANCE": 0.005,
+
+    # This setting controls whether each design is first simulated over a few representative weeks only, and then over
+    # the full run period of the model if it stays competitive.
+    # NOTE - This value must be a boolean. The screened net site energy consumption is extrapolated to the full run
+    #  period, while the PPD statistic is taken over the screened weeks as it is.
+    "SCREENING": False,
+
+    # This setting controls the weeks of the screening simulations, which are read from the .STAT file next to the
+    # weather file.
+    # NOTE - This value must be a tuple of "Typical" or "Extreme", followed by "Winter", "Spring", "Summer" or
+    #  "Autumn", strings. The extreme weeks bias the extrapolated net site energy consumption.
+    "SCREENING_WEEKS": ("Typical Winter", "Typical Spring", "Typical Summer", "Typical Autumn"),
+
+    # This setting controls the number of days simulated from each screening week.
+    # NOTE - This value must be a positive integer or None, in which case the weeks are simulated as they are.
+    "SCREENING_DAYS": 7,
+
+    # This setting controls how much worse than the full-fidelity Pareto front, relatively, the screened objectives of
+    # a design may be, while the design is still promoted to the full run period.
+    # NOTE - This value must be a float between 0 and 1. Higher values promote more designs.
+    "PROMOTION_MARGIN": 0.05,
+
+    # This setting controls whether the optimization is steady-state instead of generational, i.e. whether each
+    # simulation result is inserted into the population as soon as it arrives and a new offspring is simulated in its
+    # place, so that the workers never wait for the slowest simulation of a generation.
+    # NOTE - This value must be a boolean. It is not supported along with SCREENING.
+    "STEADY_STATE": False,
+
+    # This setting controls the number of offspring evaluated at any time during a steady-state optimization.
+    # NOTE - This value must be a positive integer or None, in which case it is equal to the number of workers.
+    "STEADY_STATE_IN_FLIGHT": None
 }
@@ -40,4 +40,6 @@ setuptools.setup(name="ADAPT",
                                    "numpy",
                                    "openstudio",
                                    "pandas",
-                                   "pymoo==0.5.0"])
+                                   "pymoo==0.5.0"],
+                 extras_require={"logs": ["pyarrow"],
+                                 "surrogate": ["scikit-learn"]})
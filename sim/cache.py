@@ -0,0 +1,184 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy
+
+import prefs.parameters
+import utils.file_manager
+import utils.optimization
+
+
+class ResultCache:
+    """Store the objectives of every simulated design inside a persistent SQLite database, which is shared by all the
+    processes running simulations of the same model."""
+
+    def __init__(self, idf: str, epw: str, path="../database/sim/cache/results.sqlite",
+                 max_entries=prefs.parameters.parameters["CACHE_SIZE"],
+                 decimals=prefs.parameters.parameters["SAMPLING_DECIMALS"],
+                 ep_version=prefs.parameters.parameters["EPLUS_VERSION"], fidelity=None,
+                 warm_start=prefs.parameters.parameters["WARM_START"],
+                 warmup_days=prefs.parameters.parameters["WARMUP_DAYS"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        idf: str
+            The path to the base model.
+
+        epw: str
+            The path to the weather file.
+
+        max_entries: int
+            The maximum number of stored designs, beyond which the least recently used ones are evicted.
+
+        decimals: int
+            The number of decimal places, to which the design vectors are rounded before they are looked up.
+
+        fidelity: str
+            The description of any reduced run periods, over which the cached results were simulated. If None, the
+            results cover the run periods of the model.
+
+        warm_start: bool
+            Whether the cached results were simulated warm-started, in which case they only approximate the
+            cold-started ones.
+
+        warmup_days: int
+            The minimum number of warmup days of the warm-started simulations.
+        """
+
+        self.path = path
+        self.max_entries = max_entries
+        self.decimals = decimals
+
+        # The results of a design are only valid for the exact model, weather file and EnergyPlus™ version which
+        # produced them, so these are hashed into every key.
+        fingerprint = hashlib.sha256()
+        for filepath in (idf, epw):
+            with open(filepath, "rb") as file:
+                fingerprint.update(file.read())
+        fingerprint.update(ep_version.encode())
+
+        # NOTE - The results of reduced run periods are kept apart from those of the full ones, whose keys are left
+        #  unchanged so that existing caches remain valid.
+        if fidelity is not None:
+            fingerprint.update(fidelity.encode())
+
+        # NOTE - The same goes for warm-started results, which are only equal to the cold-started ones within the
+        #  tolerance of the warm start.
+        if warm_start:
+            fingerprint.update("warm start|{}".format(warmup_days).encode())
+        self.fingerprint = fingerprint.digest()
+
+        self.hits = 0
+        self.misses = 0
+
+        # NOTE - SQLite connections cannot be shared between processes, so each process opens its own connection.
+        self._connection = None
+        self._pid = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_pid"] = None
+
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None or self._pid != os.getpid():
+            utils.file_manager.create_directories(os.path.split(self.path)[0])
+
+            # Wait for the locks held by other processes instead of failing immediately.
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            self._pid = os.getpid()
+
+            # NOTE - Write-ahead logging allows any number of readers to proceed concurrently with a single writer.
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+
+            with self._connection:
+                self._connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                                         "key BLOB PRIMARY KEY, "
+                                         "objectives BLOB NOT NULL, "
+                                         "last_access INTEGER NOT NULL)")
+                self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+
+        return self._connection
+
+    def keys(self, X) -> list:
+        """Return the cache key of each design vector, one per row."""
+
+        return [hashlib.sha256(self.fingerprint + q.tobytes()).digest()
+                for q in utils.optimization.quantize(numpy.atleast_2d(X), self.decimals)]
+
+    def get(self, keys) -> list:
+        """Return the cached objectives of each key, or None if the corresponding design has not been simulated yet."""
+
+        found = {}
+        with self.connection as connection:
+            # NOTE - The keys are looked up in chunks to respect the SQLite limit on the number of query parameters.
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = connection.execute("SELECT key, objectives FROM results WHERE key IN ({})".format(
+                    ",".join("?" * len(chunk))), chunk).fetchall()
+                found.update((key, numpy.frombuffer(objectives, dtype="<f8")) for key, objectives in rows)
+
+            # Mark the found designs as the most recently used ones.
+            connection.executemany("UPDATE results SET last_access = ? WHERE key = ?",
+                                   [(time.time_ns(), key) for key in found])
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+
+        return [found.get(key) for key in keys]
+
+    def put(self, keys, F) -> None:
+        """Store the objectives of each key and evict the least recently used designs if the cache is full."""
+
+        with self.connection as connection:
+            connection.executemany("INSERT OR REPLACE INTO results (key, objectives, last_access) VALUES (?, ?, ?)",
+                                   [(key, numpy.asarray(f, dtype="<f8").tobytes(), time.time_ns())
+                                    for key, f in zip(keys, F)])
+
+            if self.max_entries is not None:
+                excess = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    connection.execute("DELETE FROM results WHERE key IN ("
+                                       "SELECT key FROM results ORDER BY last_access ASC LIMIT ?)", (excess,))
+
+    def statistics(self) -> dict:
+        """Return the hit and miss counters of this process along with the current size of the cache."""
+
+        size = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = self.hits + self.misses
+
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.,
+                "size": size}
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
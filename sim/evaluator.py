@@ -0,0 +1,216 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import functools
+import os
+import threading
+import warnings
+
+import numpy
+
+import prefs.parameters
+
+import sim.reader
+import sim.runner
+import sim.scheduler
+import utils.workspace
+
+
+class SimulationPool:
+    """Evaluate whole populations by running their EnergyPlus™ simulations concurrently."""
+
+    def __init__(self, idf: str, epw: str, idd="../sim/EnergyPlus/EnergyPlus.idd", n_workers=None, workspace=None,
+                 backend=prefs.parameters.parameters["READER_BACKEND"],
+                 trim=prefs.parameters.parameters["TRIM_OUTPUTS"], scheduler=None,
+                 warm_start=prefs.parameters.parameters["WARM_START"], run_periods=None) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        idf: str
+            The path to the base model, which is never modified itself.
+
+        epw: str
+            The path to the weather file.
+
+        n_workers: int
+            The maximum number of concurrent simulations. If None, all available logical cores are used.
+
+        workspace: utils.workspace.Workspace
+            The workspace managing the run directory of each simulation. If None, a new workspace is created.
+
+        backend: str
+            The result files, from which the objectives of each simulation are read.
+
+        trim: bool
+            Whether the reports and output variables, which are not required by the objectives, should be removed from
+            the model.
+
+        scheduler: sim.scheduler.JobScheduler
+            The scheduler running the simulations. If None, a new scheduler is created.
+
+        warm_start: bool
+            Whether the sizes and external shading of the base model are calculated once and reused by every
+            simulation.
+
+        run_periods: list
+            The ((begin month, begin day), (end month, end day)) pairs, over which each design is simulated instead of
+            the run periods of the model, e.g. those given by sim.screening.screening_periods. The net site energy
+            consumption is extrapolated to the run periods of the model.
+        """
+
+        self.idf = idf
+        self.epw = epw
+        self.idd = idd
+
+        self.workspace = workspace if workspace is not None else utils.workspace.Workspace()
+        self.backend = backend
+        self.trim = trim
+        self.warm_start = warm_start
+        self.run_periods = run_periods
+
+        self.scheduler = scheduler if scheduler is not None else sim.scheduler.JobScheduler(max_jobs=n_workers)
+
+        # NOTE - A scheduler shared with other pools is only closed by its owner.
+        self.owns_scheduler = scheduler is None
+
+        # The base model is parsed lazily and only once, and then patched in memory for each design.
+        self.template = None
+
+        # The number of run directories which have not been released yet.
+        self.pending = 0
+        self.released = threading.Condition()
+
+    def __getstate__(self):
+        # The template is rebuilt lazily instead of being serialized along with the whole parsed model.
+        state = self.__dict__.copy()
+        state["template"] = None
+        state["pending"] = 0
+        del state["released"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.released = threading.Condition()
+
+    def submit(self, x):
+        """Schedule the simulation of a single design and return a future holding its objectives."""
+
+        if self.template is None:
+            # NOTE - The model editor and eppy along with it are imported lazily, since only the process which
+            #  submits the simulations needs them.
+            from sim.modifier import ModelTemplate
+
+            self.template = ModelTemplate(self.idf, idd=self.idd, output_sqlite=self.backend == "sql", trim=self.trim,
+                                          warm_start=self._capture_baseline(), run_periods=self.run_periods)
+
+        # Each simulation writes its own copy of the model inside its own run directory, so that concurrent
+        # simulations never collide.
+        run_directory = self.workspace.create()
+
+        scratch_idf = os.path.join(run_directory, "in.idf")
+        self.template.save(x, scratch_idf)
+
+        # NOTE - ReadVarsESO only needs to run when the objectives are read from the eplusout.CSV file.
+        command = sim.runner.build_command(scratch_idf, self.epw, idd=self.idd, output_path=run_directory,
+                                           read_vars=self.backend == "csv")
+
+        with self.released:
+            self.pending += 1
+
+        future = self.scheduler.submit(command, run_directory,
+                                       functools.partial(sim.reader.read_objectives, run_directory, self.backend,
+                                                         scale=self.template.scale))
+
+        # NOTE - The run directory is released as soon as the objectives have been read, or the simulation has failed.
+        future.add_done_callback(functools.partial(self._release, run_directory))
+
+        return future
+
+    def _capture_baseline(self):
+        """Return the validated warm start of the base model, or None if the simulations should be cold-started."""
+
+        if not self.warm_start:
+            return None
+
+        import sim.warmstart
+
+        # NOTE - The baseline is captured only once for each model and then read from its .JSON file.
+        baseline = sim.warmstart.capture(self.idf, self.epw, idd=self.idd, trim=self.trim)
+        if baseline.errors is None:
+            warnings.warn("The warm-started base model could not be simulated, so the simulations are cold-started "
+                          "instead.")
+
+            return None
+        if not baseline.is_valid():
+            warnings.warn("The warm-started base model deviates by up to {:.2%} from the original one, so the "
+                          "simulations are cold-started instead.".format(max(baseline.errors)))
+
+            return None
+
+        return baseline
+
+    def _release(self, run_directory: str, future) -> None:
+        """Release the run directory of a finished, failed or cancelled simulation."""
+
+        # NOTE - Cancelled simulations are not considered failed, since they were interrupted on purpose.
+        failed = not future.cancelled() and future.result() is self.scheduler.penalty
+
+        try:
+            self.workspace.release(run_directory, failed=failed)
+        finally:
+            with self.released:
+                self.pending -= 1
+                self.released.notify_all()
+
+    def map(self, X) -> tuple:
+        """
+        Evaluate a population, one design per row, and return its objectives in the same order, along with a mask of
+        the designs whose simulation failed and whose objectives are penalized instead.
+        """
+
+        futures = [self.submit(x) for x in X]
+
+        try:
+            F = [future.result() for future in futures]
+        except BaseException:
+            # Kill the remaining simulations when the optimization is interrupted.
+            for future in futures:
+                future.cancel()
+            raise
+
+        # NOTE - The scheduler returns its penalty object itself for every failed job.
+        failed = numpy.array([f is self.scheduler.penalty for f in F], dtype=bool)
+
+        return numpy.array(F, dtype=float), failed
+
+    def shutdown(self, timeout=60.) -> None:
+        """Cancel all pending simulations, stop the scheduler, unless it is shared, and delete all remaining run
+        directories."""
+
+        if self.owns_scheduler:
+            self.scheduler.close()
+
+        # NOTE - The futures are resolved before their callbacks run, so the run directories may still be in the
+        #  process of being released.
+        with self.released:
+            self.released.wait_for(lambda: self.pending == 0, timeout=timeout)
+
+        self.workspace.cleanup()
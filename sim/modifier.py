@@ -35,8 +35,18 @@
 #
 #
 #
+import os
+import platform
+import re
+import threading
+
+import eppy.bunchhelpers
 import eppy.modeleditor
 
+import mods.idfreader
+import sim.reader
+import sim.screening
+
 
 def modify_schedule(x, idf, schedule_object, idd="../sim/EnergyPlus/EnergyPlus.idd", set_idd=True) -> None:
     """Edit any schedule inside a standard .IDF file."""
@@ -58,58 +68,330 @@ def modify_schedule(x, idf, schedule_object, idd="../sim/EnergyPlus/EnergyPlus.i
     idf.save()
 
 
+def _format_field(value) -> str:
+    """Format a field value exactly like eppy.bunch_subclass.EpBunch.__repr__ does when it serializes an object."""
+
+    # Integral values are written without any decimals.
+    try:
+        if int(value) == value:
+            value = int(value)
+    except ValueError:
+        pass
+
+    # NOTE - Values wider than 18 characters are written in scientific notation, because EnergyPlus™ cannot read them.
+    return ("    %s," % (eppy.bunchhelpers.scientificnotation(value, width=18),)).ljust(26)
+
+
+# NOTE - eppy keeps the .IDD file and the state of its parser on the IDF class, so models are never parsed by several
+#  threads at once (e.g. by the concurrent studies of opt/batch.py).
+_PARSE_LOCK = threading.Lock()
+
+
+# The output objects, which are not required by sim.reader and are therefore removed by trim_outputs.
+UNUSED_OUTPUTS = ("Output:VariableDictionary",
+                  "Output:Surfaces:List",
+                  "Output:Surfaces:Drawing",
+                  "Output:Constructions",
+                  "Output:Schedules",
+                  "Output:Meter",
+                  "Output:Meter:MeterFileOnly",
+                  "Output:Meter:Cumulative",
+                  "Output:Meter:Cumulative:MeterFileOnly",
+                  "Output:Table:Monthly",
+                  "Output:Table:TimeBins",
+                  "Output:Table:Annual",
+                  "Output:EnergyManagementSystem",
+                  "Output:DebuggingData")
+
+
+def trim_outputs(model: eppy.modeleditor.IDF) -> None:
+    """Strip every report and output variable, which is not read by sim.reader, from a model."""
+
+    for key in UNUSED_OUTPUTS:
+        model.removeallidfobjects(key)
+
+    # NOTE - Only the zone occupant count and PPD time series are required.
+    for variable in list(model.idfobjects["Output:Variable"]):
+        if variable.Variable_Name.lower() not in [name.lower() for name in sim.reader.OUTPUT_VARIABLES]:
+            model.removeidfobject(variable)
+
+    # NOTE - Only the summary report containing the net site energy consumption is required.
+    model.removeallidfobjects("Output:Table:SummaryReports")
+    model.newidfobject("Output:Table:SummaryReports", Report_1_Name=sim.reader.SUMMARY_REPORT)
+
+    # The tabular reports are written only once, in the format read by sim.reader.read_nse.
+    model.removeallidfobjects("OutputControl:Table:Style")
+    model.newidfobject("OutputControl:Table:Style", Column_Separator="HTML")
+
+
+def request_sqlite_output(model: eppy.modeleditor.IDF) -> None:
+    """Make EnergyPlus™ write both its time series and tabular results to an eplusout.SQL file."""
+
+    # NOTE - The tabular results are required, since they contain the net site energy consumption.
+    if model.idfobjects["Output:SQLite"]:
+        model.idfobjects["Output:SQLite"][0].Option_Type = "SimpleAndTabular"
+    else:
+        model.newidfobject("Output:SQLite", Option_Type="SimpleAndTabular")
+
+
+def expand_weekday_schedule(schedule) -> None:
+    """
+    Rewrite the weekday profile of a Schedule:Compact object as 24 hourly Until fields, so that its setpoints occupy
+    fields 15, 17, ..., 61 like modify_schedule expects. Profiles which are already hourly are left untouched.
+
+    NOTE - The ASHRAE 90.1 prototype models describe the weekday setpoints with a few setback periods only, while the
+    optimization assigns a setpoint to every hour.
+    """
+
+    def _normalize(field) -> str:
+        return re.sub(r"\s", "", str(field)).lower()
+
+    # NOTE - The object list holds the class, name and type limits, followed by the fields, starting from Field 1.
+    fields = schedule.obj[3:]
+
+    start = next((i for i, field in enumerate(fields) if re.fullmatch("for:?weekdays", _normalize(field))), None)
+    if start != 12:
+        raise ValueError("The weekday profile of schedule {} must start at field 13.".format(schedule.Name))
+
+    stop = next((i for i in range(start + 1, len(fields)) if _normalize(fields[i]).startswith("for")), len(fields))
+    pairs = list(zip(fields[start + 1:stop:2], fields[start + 2:stop:2]))
+
+    hours = []
+    for until, _ in pairs:
+        hour, minute = _normalize(until)[len("until:"):].split(":")
+        hours.append(int(hour) + int(minute) / 60)
+
+    if hours == list(range(1, 25)):
+        return
+
+    # Each hour takes the value of the period, during which it ends.
+    hourly = []
+    for hour in range(1, 25):
+        value = next(value for end, (_, value) in zip(hours, pairs) if end >= hour)
+        hourly += ["Until: {:02d}:00".format(hour), value]
+
+    schedule.obj[3 + start + 1:3 + stop] = hourly
+
+
+def read_run_periods(model: eppy.modeleditor.IDF) -> list:
+    """Return the run periods of a model in the form of ((begin month, begin day), (end month, end day)) pairs."""
+
+    return [((int(run_period.Begin_Month), int(run_period.Begin_Day_of_Month)),
+             (int(run_period.End_Month), int(run_period.End_Day_of_Month)))
+            for run_period in model.idfobjects["RunPeriod"]]
+
+
+def set_run_periods(model: eppy.modeleditor.IDF, periods) -> None:
+    """
+    Replace the run periods of a model with a list of ((begin month, begin day), (end month, end day)) pairs, none of
+    which crosses the end of the year. Every other setting is copied from the first original run period.
+    """
+
+    originals = list(model.idfobjects["RunPeriod"])
+    if not originals:
+        raise ValueError("The model does not contain any run period.")
+
+    for i, ((begin_month, begin_day), (end_month, end_day)) in enumerate(periods):
+        run_period = model.copyidfobject(originals[0])
+
+        # NOTE - The names of the run periods must be unique, unless they are blank.
+        run_period.Name = "Screening Period {}".format(i + 1)
+        run_period.Begin_Month = begin_month
+        run_period.Begin_Day_of_Month = begin_day
+        run_period.End_Month = end_month
+        run_period.End_Day_of_Month = end_day
+
+        # The periods never cross the end of the year, so they end within the year they begin, if one is given.
+        run_period.End_Year = run_period.Begin_Year
+
+    for run_period in originals:
+        model.removeidfobject(run_period)
+
+
+class ModelTemplate:
+    """Parse a standard .IDF file once and patch its setpoint schedules in memory for each design."""
+
+    def __init__(self, idf, schedule_objects=(29, 36), idd="../sim/EnergyPlus/EnergyPlus.idd", set_idd=True,
+                 output_sqlite=False, trim=False, warm_start=None, run_periods=None) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        idf: str
+            The path to the base model, which is never modified itself.
+
+        schedule_objects: tuple
+            The indices of the heating and cooling Schedule:Compact objects, in the same order as their setpoints
+            appear inside each design vector.
+
+        output_sqlite: bool
+            Whether EnergyPlus™ should write its results to an eplusout.SQL file as well.
+
+        trim: bool
+            Whether the reports and output variables, which are not read by sim.reader, should be removed.
+
+        warm_start: sim.warmstart.Baseline
+            The sizes and shading of the base model, which are hard-coded into every design. If None, each simulation
+            calculates them itself.
+
+        run_periods: list
+            The ((begin month, begin day), (end month, end day)) pairs, which replace the run periods of the model. If
+            None, the run periods of the model are kept.
+        """
+
+        with _PARSE_LOCK:
+            # The .IDD file needs to be set only once during a given workflow.
+            if set_idd:
+                eppy.modeleditor.IDF.setiddname(idd)
+
+            # NOTE - This is the only time the model is parsed (i.e. by mods/idfreader.py, which replaces the eppy
+            #  reader). eppy.modeleditor.IDF looks its reader up among the globals of its module, which are only
+            #  patched while the lock is held.
+            reader, eppy.modeleditor.idfreader1 = eppy.modeleditor.idfreader1, mods.idfreader.idfreader1
+            try:
+                self.model = eppy.modeleditor.IDF(idf)
+            finally:
+                eppy.modeleditor.idfreader1 = reader
+
+        self.schedules = [self.model.idfobjects["Schedule:Compact"][i] for i in schedule_objects]
+        for schedule in self.schedules:
+            expand_weekday_schedule(schedule)
+
+        if trim:
+            trim_outputs(self.model)
+        if output_sqlite:
+            request_sqlite_output(self.model)
+        if warm_start is not None:
+            warm_start.apply(self.model)
+
+        # The factor, by which the net site energy consumption is extrapolated to the original run periods.
+        self.scale = 1.
+        if run_periods is not None:
+            self.scale = sim.screening.count_days(read_run_periods(self.model)) / sim.screening.count_days(run_periods)
+            set_run_periods(self.model, run_periods)
+
+        self.segments = None
+        self.suffixes = None
+        self.compile()
+
+    def compile(self) -> None:
+        """Serialize the parts of the model which do not depend on the design vector."""
+
+        text = self.model.idfstr()
+
+        # Split the serialized model around the setpoint lines of each schedule, so that only these 48 lines need to
+        # be formatted for each design. Everything else is serialized by eppy exactly once.
+        self.segments = []
+        self.suffixes = []
+
+        constant = ""
+        for schedule in self.schedules:
+            representation = schedule.__repr__()
+
+            head, separator, text = text.partition(representation)
+            if not separator:
+                raise ValueError("The setpoint schedules must appear inside the model in the given order.")
+
+            # NOTE - The first line is empty, while the next three hold the object class, name and type limits.
+            lines = representation.split("\n")
+            fields = {i + 3: i for i in range(15, 63, 2)}
+
+            constant += head + lines[0]
+            for k in range(1, len(lines)):
+                if k in fields:
+                    prefix = _format_field(schedule.obj[fields[k] + 2])
+
+                    if not lines[k].startswith(prefix):
+                        raise ValueError("The setpoint lines of the schedules could not be located.")
+
+                    self.segments.append(constant)
+                    self.suffixes.append(lines[k][len(prefix):])
+
+                    constant = ""
+                else:
+                    constant += "\n" + lines[k]
+        self.segments.append(constant + text)
+
+    def render(self, x) -> str:
+        """Return the model for a given design vector in the form of a standard .IDF string."""
+
+        parts = [self.segments[0]]
+        for i in range(len(self.suffixes)):
+            parts.append("\n" + _format_field(x[i]) + self.suffixes[i])
+            parts.append(self.segments[i + 1])
+
+        return "".join(parts)
+
+    def save(self, x, path: str) -> None:
+        """Write the model for a given design vector to a standard .IDF file."""
+
+        # NOTE - This mimics eppy.modeleditor.IDF.save, so that the output is identical to that of modify_schedule.
+        text = "!- {} Line endings \n".format(platform.system()) + self.render(x)
+        text = os.linesep.join(text.splitlines())
+
+        with open(path, "wb") as file:
+            file.write(text.encode("latin-1"))
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for debugging purposes."""
+
+        x = [15.00,  # 1
+             15.00,  # 2
+             15.00,  # 3
+             15.00,  # 4
+             15.00,  # 5
+             21.00,  # 6
+             21.00,  # 7
+             21.00,  # 8
+             21.00,  # 9
+             21.00,  # 10
+             21.00,  # 11
+             21.00,  # 12
+             21.00,  # 13
+             21.00,  # 14
+             21.00,  # 15
+             21.00,  # 16
+             21.00,  # 17
+             21.00,  # 18
+             21.00,  # 19
+             21.00,  # 20
+             21.00,  # 21
+             21.00,  # 22
+             15.00,  # 23
+             15.00,  # 24
+
+             15.001,  # 1
+             15.001,  # 2
+             15.001,  # 3
+             15.001,  # 4
+             15.001,  # 5
+             21.001,  # 6
+             21.001,  # 7
+             21.001,  # 8
+             21.001,  # 9
+             21.001,  # 10
+             21.001,  # 11
+             21.001,  # 12
+             21.001,  # 13
+             21.001,  # 14
+             21.001,  # 15
+             21.001,  # 16
+             21.001,  # 17
+             21.001,  # 18
+             21.001,  # 19
+             21.001,  # 20
+             21.001,  # 21
+             21.001,  # 22
+             15.001,  # 23
+             15.001,  # 24
+             ]
+        # Heating
+        modify_schedule(x[00:24], "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf", 29)
+        # Cooling
+        modify_schedule(x[24:48], "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf", 36)
+
 
-x = [15.00,  # 1
-     15.00,  # 2
-     15.00,  # 3
-     15.00,  # 4
-     15.00,  # 5
-     21.00,  # 6
-     21.00,  # 7
-     21.00,  # 8
-     21.00,  # 9
-     21.00,  # 10
-     21.00,  # 11
-     21.00,  # 12
-     21.00,  # 13
-     21.00,  # 14
-     21.00,  # 15
-     21.00,  # 16
-     21.00,  # 17
-     21.00,  # 18
-     21.00,  # 19
-     21.00,  # 20
-     21.00,  # 21
-     21.00,  # 22
-     15.00,  # 23
-     15.00,  # 24
-
-     15.001,  # 1
-     15.001,  # 2
-     15.001,  # 3
-     15.001,  # 4
-     15.001,  # 5
-     21.001,  # 6
-     21.001,  # 7
-     21.001,  # 8
-     21.001,  # 9
-     21.001,  # 10
-     21.001,  # 11
-     21.001,  # 12
-     21.001,  # 13
-     21.001,  # 14
-     21.001,  # 15
-     21.001,  # 16
-     21.001,  # 17
-     21.001,  # 18
-     21.001,  # 19
-     21.001,  # 20
-     21.001,  # 21
-     21.001,  # 22
-     15.001,  # 23
-     15.001,  # 24
-     ]
-# Heating
-modify_schedule(x[00:24], "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf", 29)
-# Cooling
-modify_schedule(x[24:48], "../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf", 36)
\ No newline at end of file
+    main()
@@ -35,17 +35,28 @@
 #
 #
 #
-import statistics
-import warnings
+import contextlib
+import os
+import sqlite3
 
-import eppy.results.fasthtml
 import numpy
 import pandas
 
 
+# The output variables, from which the occupancy-weighted PPD is calculated, in the order their columns appear inside
+# the eplusout.CSV file.
+OUTPUT_VARIABLES = ("Zone People Occupant Count", "Zone Thermal Comfort Fanger Model PPD")
+
+# The tabular report, which contains the net site energy consumption.
+SUMMARY_REPORT = "AnnualBuildingUtilityPerformanceSummary"
+
+
 def read_nse(path="../database/sim/logs/eplustbl.htm", convert_value=True) -> float:
     """Read the net site energy consumption from a standard eplustbl.HTM EnergyPlus™ result file."""
 
+    # NOTE - eppy is imported lazily, since the tabular results are normally read from the eplusout.SQL file instead.
+    import eppy.results.fasthtml
+
     with open(path, "r") as file:
         value = eppy.results.fasthtml.tablebyindex(file, 0)[1][1][1]
 
@@ -56,42 +67,153 @@ def read_nse(path="../database/sim/logs/eplustbl.htm", convert_value=True) -> fl
     return value
 
 
-def read_ppd(mode="max") -> float:
-    """Read the occupancy-weighted PPD from a standard eplusout.HTM EnergyPlus™ result file."""
+def read_nse_sql(path="../database/sim/logs/eplusout.sql", convert_value=True) -> float:
+    """Read the net site energy consumption from a standard eplusout.SQL EnergyPlus™ result file."""
+
+    # NOTE - This is the same cell of the same table read by read_nse.
+    with contextlib.closing(sqlite3.connect("file:{}?mode=ro".format(path), uri=True)) as connection:
+        row = connection.execute("SELECT Value FROM TabularDataWithStrings "
+                                 "WHERE ReportName = ? "
+                                 "AND ReportForString = 'Entire Facility' "
+                                 "AND TableName = 'Site and Source Energy' "
+                                 "AND RowName = 'Total Site Energy' "
+                                 "AND ColumnName = 'Total Energy'", (SUMMARY_REPORT,)).fetchone()
+
+    if row is None:
+        raise ValueError("The result file does not contain the annual building utility performance summary.")
+
+    value = float(row[0])
+
+    # Convert NSE from GJ (i.e. the default value used by EnergyPlus™) to kWh.
+    if convert_value:
+        value *= 1E6 / 3600
+
+    return value
+
+
+def read_ppd(path="../database/sim/logs/eplusout.csv", mode="max") -> float:
+    """
+    Read the occupancy-weighted PPD from a standard eplusout.CSV EnergyPlus™ result file.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    mode: str
+        The statistic used to aggregate the site PPD time series, which is either "max", "mean" or "pXX", where XX is
+        a percentile between 0 and 100 (e.g. "p95").
+    """
 
     # The .CSV file contains timestamps, which are not required.
-    dataframe = pandas.read_csv("../database/sim/logs/eplusout.csv").drop("Date/Time", axis=1)
+    dataframe = pandas.read_csv(path).drop("Date/Time", axis=1)
 
     split_index = len(dataframe.columns) // 2
 
-    occ = dataframe.iloc[:, 0:split_index].to_numpy()  # TODO - DO WE NEED THE ZERO?
+    occ = dataframe.iloc[:, :split_index].to_numpy()
     ppd = dataframe.iloc[:, split_index:].to_numpy()
 
-    # Throw a RunTime warning when dividing by zero.
-    with numpy.errstate(divide='warn'):
+    return aggregate_ppd(*weigh_ppd(occ, ppd), mode=mode)
+
+
+def read_ppd_sql(path="../database/sim/logs/eplusout.sql", mode="max", frequency="Hourly") -> float:
+    """Read the occupancy-weighted PPD from a standard eplusout.SQL EnergyPlus™ result file."""
+
+    with contextlib.closing(sqlite3.connect("file:{}?mode=ro".format(path), uri=True)) as connection:
+        occ, ppd = (_read_variable(connection, name, frequency) for name in OUTPUT_VARIABLES)
+
+    return aggregate_ppd(*weigh_ppd(occ, ppd), mode=mode)
+
+
+def _read_variable(connection: sqlite3.Connection, name: str, frequency: str) -> numpy.ndarray:
+    """Read the time series of an output variable for every zone, one column per zone and one row per timestep."""
+
+    # NOTE - The zones are sorted by name, so that the columns of all variables refer to the same zones.
+    rows = connection.execute("SELECT KeyValue, Value FROM ReportData "
+                              "INNER JOIN ReportDataDictionary USING (ReportDataDictionaryIndex) "
+                              "WHERE Name = ? AND ReportingFrequency = ? "
+                              "ORDER BY KeyValue, TimeIndex", (name, frequency)).fetchall()
+    if not rows:
+        raise ValueError("The result file does not contain the {} output variable.".format(name))
+
+    n_zones = len({key for key, _ in rows})
+
+    return numpy.array([value for _, value in rows], dtype=float).reshape(n_zones, -1).T
+
+
+def read_objectives(directory="../database/sim/logs/", backend="sql", mode="max", scale=1.) -> tuple:
+    """
+    Read the occupancy-weighted PPD and the net site energy consumption of a simulation from its output directory.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    backend: str
+        The result files to be read, which is either "sql" for the eplusout.SQL file or "csv" for the eplusout.CSV and
+        eplustbl.HTM files.
+
+    scale: float
+        The factor, by which the net site energy consumption is multiplied, e.g. to extrapolate a reduced run period.
+    """
+
+    if backend == "sql":
+        path = os.path.join(directory, "eplusout.sql")
+
+        return read_ppd_sql(path, mode=mode), scale * read_nse_sql(path)
+    elif backend == "csv":
+        return (read_ppd(os.path.join(directory, "eplusout.csv"), mode=mode),
+                scale * read_nse(os.path.join(directory, "eplustbl.htm")))
+    else:
+        raise ValueError('Backend must be set to either "sql" or "csv".')
+
+
+def weigh_ppd(occ: numpy.ndarray, ppd: numpy.ndarray) -> tuple:
+    """
+    Calculate the occupancy-weighted PPD time series of the whole site, along with a mask of its occupied timesteps.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    occ: numpy.ndarray
+        The occupant count of each zone, one column per zone and one row per timestep.
+
+    ppd: numpy.ndarray
+        The PPD of each zone, in the same order as the occupant count.
+    """
+
+    total_occ = occ.sum(axis=1)
+    occupied = total_occ != 0
 
-        # Treat this warning as an error.
-        # NOTE - THIS IS A GLOBAL SETTING.
-        warnings.filterwarnings('error', category=RuntimeWarning)
+    # NOTE - The PPD of the site is zero when it is unoccupied.
+    return numpy.divide((occ * ppd).sum(axis=1), total_occ, out=numpy.zeros_like(total_occ, dtype=float),
+                        where=occupied), occupied
 
-        _ppd = []
-        for i in range(len(occ)):
-            try:
-                # This will create a PPD time series for the whole site.
-                _ppd.append(sum(occ[i, :] * ppd[i, :]) / sum(occ[i, :]))
-            except RuntimeWarning:
-                _ppd.append(0)  # The whole site is unoccupied.
 
-        # Reset the warning handling functionality back to default.
-        warnings.filterwarnings('default')
+def aggregate_ppd(site_ppd: numpy.ndarray, occupied: numpy.ndarray, mode="max") -> float:
+    """Aggregate an occupancy-weighted site PPD time series into a single value."""
 
     if mode == "max":
-        return max(_ppd)
-    elif mode == "mean":
-        _ppd = [i for i in _ppd if i != 0.]
-        return statistics.mean(ppd)
+        return float(site_ppd.max(initial=0))
+
+    # The mean value and the percentiles only refer to the occupied timesteps.
+    site_ppd = site_ppd[occupied]
+    if not len(site_ppd):
+        return 0.
+
+    if mode == "mean":
+        return float(site_ppd.mean())
+    elif mode.startswith("p"):
+        try:
+            percentile = float(mode[1:])
+        except ValueError:
+            percentile = -1
+        if not 0 <= percentile <= 100:
+            raise ValueError('Percentile modes must be set to "pXX", where XX is a number between 0 and 100.')
+
+        return float(numpy.percentile(site_ppd, percentile))
     else:
-        raise ValueError('Mode must be set to either "max" or "mean".')
+        raise ValueError('Mode must be set to either "max", "mean" or "pXX".')
 
 
 if __name__ == "__main__":
@@ -35,18 +35,68 @@
 #
 #
 #
-import eppy.modeleditor
+import os
+import shlex
+
+import prefs.parameters
 
 
 def run_eplus(idf: str, epw: str, idd="EnergyPlus/EnergyPlus.idd", set_idd=True, output_path="../database/sim/logs/",
-              read_vars=True, verbose="s") -> None:
+              read_vars=True, verbose="s", ep_version=prefs.parameters.parameters["EPLUS_VERSION"]) -> None:
     """Run an EnergyPlus™ whole building performance sim."""
 
+    # NOTE - eppy is imported lazily, since it is slow to import and most processes only need to build commands.
+    import eppy.modeleditor
+    import eppy.runner.run_functions
+
     # The .IDD file needs to be set only once during a given workflow.
     if set_idd:
         eppy.modeleditor.IDF.setiddname(idd)
 
-    eppy.modeleditor.IDF(idf, epw).run(output_directory=output_path, readvars=read_vars, verbose=verbose)
+    # NOTE - The model is passed to EnergyPlus™ by its path, instead of through eppy.modeleditor.IDF.run, because the
+    #  latter parses the model once more and then writes it to an in.idf file inside the current working directory,
+    #  which is shared by all concurrent simulations.
+    eppy.runner.run_functions.run(idf, epw, output_directory=output_path, idd=eppy.modeleditor.IDF.iddname,
+                                  readvars=read_vars, verbose=verbose, ep_version=ep_version)
+
+
+def build_command(idf: str, epw: str, idd=None, output_path="../database/sim/logs/", read_vars=True,
+                  ep_version=prefs.parameters.parameters["EPLUS_VERSION"],
+                  executable=prefs.parameters.parameters["EPLUS_EXECUTABLE"]) -> list:
+    """
+    Build the command line, which runs an EnergyPlus™ whole building performance sim, without running it.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    executable: str or list
+        The EnergyPlus™ executable, along with any arguments preceding the standard ones. If None, the executable of
+        the installation given by the .IDD file or the EnergyPlus™ version is used. Relative paths to existing files
+        are resolved against the current working directory.
+    """
+
+    if executable is None:
+        import eppy.runner.run_functions
+
+        # NOTE - This is the same executable used by eppy.runner.run_functions.run.
+        command = [eppy.runner.run_functions.install_paths(ep_version, idd)[0]]
+    elif isinstance(executable, str):
+        command = shlex.split(executable)
+    else:
+        command = list(executable)
+
+    # NOTE - The simulations run inside their own directory, so the relative paths to existing files among the
+    #  arguments of the executable, such as the script run by an interpreter, are made absolute.
+    command = [os.path.abspath(argument) if os.path.isfile(argument) else argument for argument in command]
+
+    command += ["--weather", os.path.abspath(epw), "--output-directory", os.path.abspath(output_path)]
+    if idd is not None:
+        command += ["--idd", os.path.abspath(idd)]
+    if read_vars:
+        command += ["--readvars"]
+
+    return command + [os.path.abspath(idf)]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import asyncio
+import concurrent.futures
+import os
+import subprocess
+import threading
+import time
+
+import prefs.parameters
+
+
+class SimulationError(Exception):
+    """Raised when an EnergyPlus™ simulation exits unsuccessfully."""
+
+
+class JobScheduler:
+    """Run EnergyPlus™ simulation jobs as asynchronous subprocesses with bounded concurrency, timeouts and retries."""
+
+    def __init__(self, max_jobs=None, timeout=prefs.parameters.parameters["SIMULATION_TIMEOUT"],
+                 retries=prefs.parameters.parameters["SIMULATION_RETRIES"], backoff=1.,
+                 penalty=prefs.parameters.parameters["SIMULATION_PENALTY"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        max_jobs: int
+            The maximum number of concurrent simulations. If None, all available logical cores are used.
+
+        timeout: float
+            The wall-clock time, in seconds, after which a simulation is killed. If None, simulations never time out.
+
+        retries: int
+            The number of times a failed simulation is retried.
+
+        backoff: float
+            The delay, in seconds, before the first retry of a failed simulation, which doubles with every retry.
+
+        penalty: tuple
+            The result of each job whose simulation could not be completed, which is returned as is, so that failed
+            jobs can be told apart by identity.
+        """
+
+        self.max_jobs = max_jobs if max_jobs is not None else os.cpu_count()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.penalty = penalty
+
+        # The failures of the jobs submitted so far, in the form of (command, exception) pairs.
+        self.failures = []
+
+        # The start and end times of every simulation run so far, including failed attempts, in the form of (start, end)
+        # pairs of UNIX timestamps.
+        self.runtimes = []
+
+        # The start times of the simulations running at the moment.
+        self._running = []
+
+        # NOTE - The event loop runs inside its own thread, so that jobs can be submitted from synchronous code, and is
+        #  started lazily, so that the scheduler can be serialized along with the optimization problem.
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._futures = set()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_loop"] = None
+        state["_thread"] = None
+        state["_semaphore"] = None
+        state["_futures"] = set()
+        state["_running"] = []
+
+        return state
+
+    def start(self) -> None:
+        """Start the event loop thread, unless it is already running."""
+
+        if self._loop is not None:
+            return
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="JobScheduler", daemon=True)
+        self._thread.start()
+
+        async def create_semaphore():
+            return asyncio.BoundedSemaphore(self.max_jobs)
+
+        self._semaphore = asyncio.run_coroutine_threadsafe(create_semaphore(), self._loop).result()
+
+    def submit(self, command: list, cwd: str, read) -> concurrent.futures.Future:
+        """
+        Schedule a simulation job and return a future holding its result.
+
+        ----------------
+        Input Parameters
+        ----------------
+
+        command: list
+            The command line, which runs the simulation.
+
+        cwd: str
+            The working directory of the simulation.
+
+        read: callable
+            The function, which reads the result of the job after the simulation has exited successfully. Any
+            exception it raises is treated as a failure of the simulation.
+        """
+
+        self.start()
+
+        future = asyncio.run_coroutine_threadsafe(self._run(command, cwd, read), self._loop)
+
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+        return future
+
+    async def _run(self, command: list, cwd: str, read):
+        """Run a simulation job until it succeeds or runs out of retries."""
+
+        for attempt in range(self.retries + 1):
+            # NOTE - The worker is released while backing off, so that other jobs can use it in the meantime.
+            if attempt:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+
+            async with self._semaphore:
+                try:
+                    await self._execute(command, cwd)
+
+                    # NOTE - The result files are read inside the default thread pool, so that the event loop is never
+                    #  blocked.
+                    return await asyncio.get_running_loop().run_in_executor(None, read)
+                # NOTE - Cancellation is not caught here, since it is not an Exception.
+                except Exception as exception:
+                    failure = exception
+
+        self.failures.append((command, failure))
+
+        return self.penalty
+
+    async def _execute(self, command: list, cwd: str) -> None:
+        """Run a single simulation and wait for it to exit, killing it if it times out or is cancelled."""
+
+        start = time.time()
+        process = await asyncio.create_subprocess_exec(*command, cwd=cwd, stdout=subprocess.DEVNULL,
+                                                       stderr=subprocess.DEVNULL)
+        self._running.append(start)
+        try:
+            return_code = await asyncio.wait_for(process.wait(), self.timeout)
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+            self.runtimes.append((start, time.time()))
+            self._running.remove(start)
+
+        if return_code != 0:
+            raise SimulationError("The simulation exited with code {}.".format(return_code))
+
+    def utilization(self, start: float, end: float) -> float:
+        """Return the fraction of the worker time between two UNIX timestamps, which was spent running simulations."""
+
+        if end <= start:
+            return 0.
+
+        # NOTE - The simulations still running are counted until the end of the period.
+        runtimes = list(self.runtimes) + [(running, end) for running in list(self._running)]
+        busy = sum(max(0., min(stop, end) - max(begin, start)) for begin, stop in runtimes)
+
+        return busy / (self.max_jobs * (end - start))
+
+    def cancel(self) -> None:
+        """Cancel all pending jobs and kill all running simulations."""
+
+        for future in list(self._futures):
+            future.cancel()
+
+    def close(self) -> None:
+        """Cancel all jobs and stop the event loop thread."""
+
+        if self._loop is None:
+            return
+
+        self.cancel()
+
+        async def drain():
+            # Wait for the cancelled jobs to kill their simulations.
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            await asyncio.get_running_loop().shutdown_default_executor()
+
+        asyncio.run_coroutine_threadsafe(drain(), self._loop).result()
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
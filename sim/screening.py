@@ -0,0 +1,141 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import calendar
+import datetime
+import os
+import re
+
+import prefs.parameters
+
+
+# The month numbers by their abbreviations, as they appear inside .STAT files.
+MONTHS = {name: i for i, name in enumerate(calendar.month_abbr) if name}
+
+# NOTE - Any non-leap year will do, since typical meteorological years always span 365 days.
+_YEAR = 2021
+
+
+def find_stat(epw: str, missing_ok=False):
+    """Return the path to the .STAT file next to a weather file, which is named either after the weather file itself
+    or after its .CSV conversion (i.e. with an additional EPW suffix). If there is none, None is returned when missing
+    files are acceptable."""
+
+    stem = os.path.splitext(epw)[0]
+    for path in (stem + ".stat", stem + "EPW.stat"):
+        if os.path.isfile(path):
+            return path
+
+    if missing_ok:
+        return None
+
+    raise FileNotFoundError("The weather file {} is not accompanied by a .STAT file.".format(epw))
+
+
+def read_typical_periods(path: str) -> dict:
+    """
+    Read the typical and extreme weeks of each season from a standard .STAT file, in the form of
+    ((begin month, begin day), (end month, end day)) pairs named after their season, e.g. "Typical Summer".
+    """
+
+    periods = {}
+
+    name = None
+    with open(path, "r", encoding="latin-1") as file:
+        for line in file:
+            # NOTE - Each period is described by a heading, followed by the period selected for it.
+            match = re.match(r"\s*((?:Typical|Extreme) \w+) Week", line)
+            if match:
+                name = match.group(1)
+                continue
+
+            match = re.search(r"Period selected:\s*(\w{3})\s*(\d+):\s*(\w{3})\s*(\d+)", line)
+            if match and name is not None:
+                periods[name] = ((MONTHS[match.group(1)], int(match.group(2))),
+                                 (MONTHS[match.group(3)], int(match.group(4))))
+                name = None
+
+    return periods
+
+
+def screening_periods(epw: str, weeks=prefs.parameters.parameters["SCREENING_WEEKS"],
+                      n_days=prefs.parameters.parameters["SCREENING_DAYS"]) -> list:
+    """
+    Return the run periods of the screening simulations of a weather file, none of which crosses the end of the year.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    weeks: tuple
+        The names of the periods inside the .STAT file, which are simulated.
+
+    n_days: int
+        The number of days simulated from each period. Longer periods are trimmed around their middle day. If None,
+        the periods are simulated as they are.
+    """
+
+    available = read_typical_periods(find_stat(epw))
+
+    periods = []
+    for week in weeks:
+        if week not in available:
+            raise ValueError("The .STAT file of {} does not contain the {} week.".format(epw, week))
+
+        (begin_month, begin_day), (end_month, end_day) = available[week]
+        begin = datetime.date(_YEAR, begin_month, begin_day)
+        end = datetime.date(_YEAR + ((end_month, end_day) < (begin_month, begin_day)), end_month, end_day)
+
+        # NOTE - Some periods span more than a week (e.g. those around the winter holidays).
+        length = (end - begin).days + 1
+        if n_days is not None and length > n_days:
+            begin += datetime.timedelta(days=(length - n_days) // 2)
+            end = begin + datetime.timedelta(days=n_days - 1)
+
+        # The periods crossing the end of the year are split in two.
+        if end.year > begin.year:
+            periods.append(((begin.month, begin.day), (12, 31)))
+            begin = datetime.date(end.year, 1, 1)
+        periods.append(((begin.month, begin.day), (end.month, end.day)))
+
+    return periods
+
+
+def count_days(periods) -> int:
+    """Return the total number of days inside a list of ((begin month, begin day), (end month, end day)) pairs."""
+
+    days = 0
+    for begin, end in periods:
+        # NOTE - Periods whose end precedes their beginning cross the end of the year.
+        days += (datetime.date(_YEAR + (end < begin), *end) - datetime.date(_YEAR, *begin)).days + 1
+
+    return days
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for debugging purposes."""
+
+        periods = screening_periods("../database/sim/model/USA_AZ_Tucson-Davis-Monthan.AFB.722745_TMY3.epw")
+
+        for (begin_month, begin_day), (end_month, end_day) in periods:
+            print("{} {:2d} - {} {:2d}".format(calendar.month_abbr[begin_month], begin_day,
+                                               calendar.month_abbr[end_month], end_day))
+        print("Simulated Days: {}".format(count_days(periods)))
+
+
+    main()
@@ -0,0 +1,127 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+
+import pandas
+
+import sim.reader
+
+
+# NOTE - This module is a development tool, which mimics the command line interface and the result files of
+#  EnergyPlus™, so that the simulation scheduler can be exercised without an EnergyPlus™ installation. Use it by
+#  setting EPLUS_EXECUTABLE to e.g. "python ../sim/stub_eplus.py --delay 1 --failure-rate 0.1", with the root
+#  directory of the project on the PYTHONPATH, since it imports sim.reader.
+
+
+def synthesize_sql(directory: str, path: str) -> None:
+    """
+    Write the subset of a standard eplusout.SQL EnergyPlus™ result file, which is read by sim.reader, using the
+    eplusout.CSV and eplustbl.HTM files of a previous simulation.
+    """
+
+    nse = sim.reader.read_nse(os.path.join(directory, "eplustbl.htm"), convert_value=False)
+    dataframe = pandas.read_csv(os.path.join(directory, "eplusout.csv")).drop("Date/Time", axis=1)
+
+    with contextlib.closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("CREATE TABLE ReportDataDictionary (ReportDataDictionaryIndex INTEGER PRIMARY KEY, "
+                           "KeyValue TEXT, Name TEXT, ReportingFrequency TEXT, Units TEXT)")
+        connection.execute("CREATE TABLE ReportData (ReportDataIndex INTEGER PRIMARY KEY, TimeIndex INTEGER, "
+                           "ReportDataDictionaryIndex INTEGER, Value REAL)")
+        connection.execute("CREATE TABLE TabularDataWithStrings (ReportName TEXT, ReportForString TEXT, "
+                           "TableName TEXT, RowName TEXT, ColumnName TEXT, Units TEXT, Value TEXT)")
+
+        # The column headers are given in the "KEY:Name [Units](Frequency)" format.
+        for i, column in enumerate(dataframe.columns):
+            key, _, variable = column.strip().partition(":")
+            name, _, units = variable.partition(" [")
+            units, _, frequency = units.partition("](")
+
+            connection.execute("INSERT INTO ReportDataDictionary VALUES (?, ?, ?, ?, ?)",
+                               (i, key, name, frequency.rstrip(")"), units))
+            connection.executemany("INSERT INTO ReportData (TimeIndex, ReportDataDictionaryIndex, Value) "
+                                   "VALUES (?, ?, ?)",
+                                   [(t, i, float(value)) for t, value in enumerate(dataframe[column])])
+
+        connection.execute("INSERT INTO TabularDataWithStrings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           ("AnnualBuildingUtilityPerformanceSummary", "Entire Facility", "Site and Source Energy",
+                            "Total Site Energy", "Total Energy", "GJ", "{:19.2f}".format(nse)))
+
+
+def run_stub(arguments: argparse.Namespace) -> int:
+    """Write the result files of a previous simulation as if the given model had just been simulated."""
+
+    time.sleep(arguments.delay)
+
+    # Mimic crashed and hung simulations.
+    if random.random() < arguments.failure_rate:
+        return 1
+    if random.random() < arguments.hang_rate:
+        while True:
+            time.sleep(60)
+
+    output_directory = arguments.output_directory
+    os.makedirs(output_directory, exist_ok=True)
+
+    for filename in ("eplusout.err", "eplusout.end", "eplustbl.htm"):
+        shutil.copy(os.path.join(arguments.results, filename), output_directory)
+
+    if arguments.readvars:
+        shutil.copy(os.path.join(arguments.results, "eplusout.csv"), output_directory)
+
+    with open(arguments.idf, "r", encoding="latin-1") as file:
+        output_sqlite = "output:sqlite," in file.read().lower()
+    if output_sqlite:
+        synthesize_sql(arguments.results, os.path.join(output_directory, "eplusout.sql"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point of the stub executable."""
+
+        parser = argparse.ArgumentParser(description="Mimic an EnergyPlus™ simulation.")
+
+        # Standard EnergyPlus™ arguments.
+        parser.add_argument("--weather", "-w")
+        parser.add_argument("--output-directory", "-d", default=".")
+        parser.add_argument("--idd", "-i")
+        parser.add_argument("--readvars", "-r", action="store_true")
+        parser.add_argument("--expandobjects", "-x", action="store_true")
+        parser.add_argument("idf")
+
+        # Stub arguments.
+        parser.add_argument("--results", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                              "..", "database", "sim", "logs"),
+                            help="the directory holding the result files of a previous simulation")
+        parser.add_argument("--delay", type=float, default=0., help="the duration of each simulation in seconds")
+        parser.add_argument("--failure-rate", type=float, default=0., help="the probability of a crash")
+        parser.add_argument("--hang-rate", type=float, default=0., help="the probability of a hang")
+
+        sys.exit(run_stub(parser.parse_args()))
+
+
+    main()
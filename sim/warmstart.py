@@ -0,0 +1,295 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import time
+
+import prefs.parameters
+
+import sim.modifier
+import sim.reader
+import sim.runner
+import utils.file_manager
+
+
+# The external shading results, which are written by the base model and imported by every warm-started model.
+SHADING_FILE = "eplusshading.csv"
+
+# The prefix of the component sizes, which were calculated by EnergyPlus™ instead of being given by the model.
+DESIGN_SIZE = "Design Size "
+
+
+def _normalize(name) -> str:
+    """Reduce an object type, object name or field name to its lowercase alphanumeric characters."""
+
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def read_component_sizes(path="../database/sim/logs/eplusout.sql") -> list:
+    """
+    Read the autosized values of every component from a standard eplusout.SQL EnergyPlus™ result file, in the form of
+    (object type, object name, field name, value) records.
+    """
+
+    with contextlib.closing(sqlite3.connect("file:{}?mode=ro".format(path), uri=True)) as connection:
+        try:
+            rows = connection.execute("SELECT CompType, CompName, Description, Value FROM ComponentSizes").fetchall()
+        # NOTE - The table is only written when at least one component has been sized.
+        except sqlite3.OperationalError:
+            return []
+
+    sizes = []
+    for comp_type, comp_name, description, value in rows:
+        # NOTE - The descriptions of some components include their units, e.g. "Design Size Nominal Capacity [W]".
+        description = re.sub(r"\s*\[.*\]\s*$", "", description)
+
+        # The user-specified sizes are already part of the model.
+        if description.startswith(DESIGN_SIZE):
+            sizes.append((comp_type, comp_name, description[len(DESIGN_SIZE):], value))
+
+    return sizes
+
+
+def _shadow_calculation(model):
+    """Return the ShadowCalculation object of a model, which is created if it does not exist."""
+
+    if model.idfobjects["ShadowCalculation"]:
+        return model.idfobjects["ShadowCalculation"][0]
+
+    return model.newidfobject("ShadowCalculation")
+
+
+class Baseline:
+    """
+    Hold the results of the base model, which do not depend on the setpoint schedules, so that they are calculated once
+    instead of for every design.
+
+    NOTE - The sizing periods are simulated using the design day profiles of the setpoint schedules, which are never
+     modified, and the external shading depends only on the geometry and the weather file.
+    """
+
+    def __init__(self, sizes=(), shading=None, objectives=None,
+                 warmup_days=prefs.parameters.parameters["WARMUP_DAYS"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        sizes: list
+            The autosized values of the base model, in the form of (object type, object name, field name, value)
+            records.
+
+        shading: str
+            The path to the external shading results of the base model. If None, shading is calculated for each design.
+
+        objectives: tuple
+            The objectives of the base model, against which the warm-started objectives are validated.
+
+        warmup_days: int
+            The minimum number of warmup days of each warm-started simulation.
+        """
+
+        self.sizes = [tuple(record) for record in sizes]
+        self.shading = shading
+        self.objectives = objectives
+        self.warmup_days = warmup_days
+
+        # The relative errors and the runtimes of the base model, when it is warm-started and when it is not. The errors
+        # are None if the warm-started base model could not be simulated.
+        self.errors = None
+        self.timings = None
+
+    def apply(self, model) -> None:
+        """Hard-code the sizes, import the shading and shorten the warmup of a parsed model in place."""
+
+        sizes = {(_normalize(comp_type), _normalize(comp_name), _normalize(field)): value
+                 for comp_type, comp_name, field, value in self.sizes}
+
+        remaining = 0
+        for key in model.idfobjects:
+            for idf_object in model.idfobjects[key]:
+                # NOTE - The object list holds the class, followed by its fields, which start from the name.
+                name = _normalize(idf_object.obj[1]) if len(idf_object.obj) > 1 else ""
+
+                for i, value in enumerate(idf_object.obj):
+                    if str(value).lower() not in ("autosize", "autocalculate"):
+                        continue
+
+                    size = sizes.get((_normalize(idf_object.key), name, _normalize(idf_object.fieldnames[i])))
+                    if size is not None:
+                        idf_object.obj[i] = size
+                    elif str(value).lower() == "autosize":
+                        remaining += 1
+
+        # NOTE - The sizing calculations are only skipped when no field relies on them anymore. Any autocalculated
+        #  fields left behind are calculated without them.
+        if not remaining:
+            for control in model.idfobjects["SimulationControl"]:
+                control.Do_Zone_Sizing_Calculation = "No"
+                control.Do_System_Sizing_Calculation = "No"
+                control.Do_Plant_Sizing_Calculation = "No"
+                control.Run_Simulation_for_Sizing_Periods = "No"
+
+        if self.shading is not None:
+            calculation = _shadow_calculation(model)
+            calculation.External_Shading_Calculation_Method = "ImportedShading"
+            calculation.Output_External_Shading_Calculation_Results = "No"
+
+            model.removeallidfobjects("Schedule:File:Shading")
+            model.newidfobject("Schedule:File:Shading", File_Name=os.path.abspath(self.shading))
+
+        # NOTE - Only the minimum is lowered, so that each simulation still warms up until its loads and temperatures
+        #  have converged.
+        for building in model.idfobjects["Building"]:
+            building.Minimum_Number_of_Warmup_Days = self.warmup_days
+
+    def is_valid(self, tolerance=prefs.parameters.parameters["WARM_START_TOLERANCE"]) -> bool:
+        """Check whether the warm-started objectives of the base model are within a relative tolerance."""
+
+        return self.errors is not None and max(self.errors) <= tolerance
+
+    def save(self, path: str) -> None:
+        """Write the baseline to a .JSON file."""
+
+        with open(path, "w") as file:
+            json.dump(self.__dict__, file, indent=4)
+
+    @classmethod
+    def load(cls, path: str):
+        """Read a baseline from a .JSON file written by Baseline.save."""
+
+        with open(path, "r") as file:
+            state = json.load(file)
+
+        baseline = cls()
+        baseline.__dict__.update(state)
+        baseline.sizes = [tuple(record) for record in baseline.sizes]
+
+        return baseline
+
+
+def _simulate(model, run_directory: str, epw: str, idd: str, ep_version: str, executable, timeout) -> tuple:
+    """Run a parsed model inside its own run directory and return its objectives along with its runtime."""
+
+    utils.file_manager.create_directories(run_directory)
+
+    scratch_idf = os.path.join(run_directory, "in.idf")
+    model.saveas(scratch_idf)
+
+    command = sim.runner.build_command(scratch_idf, epw, idd=idd, output_path=run_directory, read_vars=False,
+                                       ep_version=ep_version, executable=executable)
+
+    start = time.perf_counter()
+    subprocess.run(command, cwd=run_directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout,
+                   check=True)
+    runtime = time.perf_counter() - start
+
+    return sim.reader.read_objectives(run_directory, "sql"), runtime
+
+
+def capture(idf: str, epw: str, idd="../sim/EnergyPlus/EnergyPlus.idd", directory="../database/sim/warmstart/",
+            trim=prefs.parameters.parameters["TRIM_OUTPUTS"],
+            warmup_days=prefs.parameters.parameters["WARMUP_DAYS"],
+            ep_version=prefs.parameters.parameters["EPLUS_VERSION"],
+            executable=prefs.parameters.parameters["EPLUS_EXECUTABLE"],
+            timeout=prefs.parameters.parameters["SIMULATION_TIMEOUT"]) -> Baseline:
+    """
+    Simulate the base model once to capture its sizes and shading, and once more warm-started to validate them.
+
+    The baseline is stored inside its own directory for each model, weather file and EnergyPlus™ version, so that it is
+    captured only once.
+    """
+
+    # NOTE - This is the same fingerprint used by sim.cache.ResultCache, along with the settings of the warm start.
+    fingerprint = hashlib.sha256()
+    for filepath in (idf, epw):
+        with open(filepath, "rb") as file:
+            fingerprint.update(file.read())
+    fingerprint.update("{}|{}|{}".format(ep_version, trim, warmup_days).encode())
+
+    directory = os.path.join(directory, fingerprint.hexdigest()[:16])
+    path = os.path.join(directory, "baseline.json")
+    if os.path.isfile(path):
+        return Baseline.load(path)
+
+    # The base model writes both its sizes and its external shading results.
+    cold = sim.modifier.ModelTemplate(idf, idd=idd, output_sqlite=True, trim=trim)
+    _shadow_calculation(cold.model).Output_External_Shading_Calculation_Results = "Yes"
+
+    cold_directory = os.path.join(directory, "cold")
+    objectives, cold_runtime = _simulate(cold.model, cold_directory, epw, idd, ep_version, executable, timeout)
+
+    # NOTE - The shading results are only written by the EnergyPlus™ versions which can import them.
+    shading = None
+    if os.path.isfile(os.path.join(cold_directory, SHADING_FILE)):
+        shading = os.path.abspath(os.path.join(directory, SHADING_FILE))
+        shutil.copy(os.path.join(cold_directory, SHADING_FILE), shading)
+
+    baseline = Baseline(read_component_sizes(os.path.join(cold_directory, "eplusout.sql")), shading, objectives,
+                        warmup_days)
+
+    warm = sim.modifier.ModelTemplate(idf, idd=idd, set_idd=False, output_sqlite=True, trim=trim,
+                                      warm_start=baseline)
+
+    warm_directory = os.path.join(directory, "warm")
+    try:
+        warm_objectives, warm_runtime = _simulate(warm.model, warm_directory, epw, idd, ep_version, executable,
+                                                  timeout)
+    # NOTE - The warm-started model may fail, e.g. when an autocalculated field still relies on the skipped sizing
+    #  calculations, in which case the baseline is recorded as invalid, so that the simulations are cold-started.
+    except Exception:
+        baseline.timings = [cold_runtime, None]
+        baseline.save(path)
+
+        # The run directory of the warm-started model is kept, so that its errors can be inspected.
+        utils.file_manager.delete_directory(cold_directory)
+
+        return baseline
+
+    baseline.errors = [abs(warm_objective - objective) / max(abs(objective), 1E-9)
+                       for warm_objective, objective in zip(warm_objectives, objectives)]
+    baseline.timings = [cold_runtime, warm_runtime]
+    baseline.save(path)
+
+    # NOTE - The run directories are only deleted once the baseline has been captured successfully, so that the
+    #  errors of any failed simulation can be inspected.
+    for run_directory in (cold_directory, warm_directory):
+        utils.file_manager.delete_directory(run_directory)
+
+    return baseline
+
+
+if __name__ == "__main__":
+    def main():
+        """Entry point for debugging purposes."""
+
+        baseline = capture("../database/sim/model/ASHRAE901_OfficeMedium_STD2019_Tucson.idf",
+                           "../database/sim/model/USA_AZ_Tucson-Davis-Monthan.AFB.722745_TMY3.epw")
+
+        print("Hard-coded Sizes: {}".format(len(baseline.sizes)))
+        print("Relative Errors: {}".format(baseline.errors))
+        print("Runtimes: {} s (cold), {} s (warm)".format(*baseline.timings))
+
+
+    main()
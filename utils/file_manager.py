@@ -16,7 +16,9 @@
 #          along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
+import os
 import pathlib
+import shutil
 
 
 def create_directories(path: str) -> None:
@@ -32,11 +34,41 @@ def create_directories(path: str) -> None:
     pathlib.Path(path).mkdir(parents=True, exist_ok=True)
 
 
-# TODO - Fill in this function.
 def delete_file(filepath: str) -> None:
-    pass
+    """
+    Delete a file at a specified location, if it exists.
+
+    Parameters:
+        filepath (str):
+    Returns:
+        None
+    """
+    pathlib.Path(filepath).unlink(missing_ok=True)
+
+
+def delete_directory(path: str) -> None:
+    """
+    Delete a directory along with all its contents at a specified location, if it exists.
+
+    Parameters:
+        path (str):
+    Returns:
+        None
+    """
+    shutil.rmtree(path, ignore_errors=True)
 
 
-# TODO - Fill in this function.
 def move_file(current_filepath: str, new_filepath: str) -> None:
-    pass
+    """
+    Move a file or a directory to a new location, creating the parents of the latter if they do not exist.
+
+    Parameters:
+        current_filepath (str):
+        new_filepath (str):
+    Returns:
+        None
+    """
+    create_directories(os.path.dirname(os.path.abspath(new_filepath)))
+
+    # NOTE - This also works across different file systems (e.g. from a RAM disk to a network drive).
+    shutil.move(current_filepath, new_filepath)
@@ -85,3 +85,56 @@ def read_problem_bounds(filepath: str) -> npt.NDArray:
             data.append(row)
 
     return np.array(data, dtype="f")
+
+
+def quantize(X: npt.NDArray, decimals: int) -> npt.NDArray:
+    """
+    Map real floating-point design vectors to integers on the grid defined by a given number of decimal places.
+
+    Design vectors which are equal when rounded to the given number of decimal places are mapped to the same integers,
+    so that they can be compared, hashed and sorted exactly.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    X: numpy.ndarray
+        The design vectors to be quantized, one per row.
+
+    decimals: int
+        The number of decimal places, to which the design vectors should be rounded.
+    """
+
+    return np.round(np.asarray(X, dtype=float) * 10 ** decimals).astype("<i8")
+
+
+def snap(X: npt.NDArray, xl: npt.NDArray, xu: npt.NDArray, decimals: int) -> npt.NDArray:
+    """
+    Round real floating-point design vectors down to the grid defined by a given number of decimal places, while
+    respecting the closed sim problem bounds.
+
+    Since the upper bounds are extended by one grid step (see close_bound), rounding down maps the half-open interval
+    [a, b + 10^-decimals) uniformly to the grid points between a and b.
+
+    ----------------
+    Input Parameters
+    ----------------
+
+    X: numpy.ndarray
+        The design vectors to be rounded, one per row.
+
+    xl: numpy.ndarray
+        The lower sim variable bounds.
+
+    xu: numpy.ndarray
+        The closed upper sim variable bounds.
+
+    decimals: int
+        The number of decimal places, to which the design vectors should be rounded.
+    """
+
+    # NOTE - A small tolerance keeps the values already on the grid from being rounded down to the previous step due
+    #  to the floating-point representation of the decimal places.
+    X = np.floor(np.asarray(X, dtype=float) * 10 ** decimals + 1E-6) / 10 ** decimals
+
+    return np.clip(X, xl, np.round(np.asarray(xu, dtype=float) - 10 ** -decimals, decimals))
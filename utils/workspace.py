@@ -0,0 +1,104 @@
+#  ADAPT is a Python program for the opt of building energy
+#  consumption and human comfort.
+#          Copyright (C) 2021-2022 Dimitris Mantas
+#
+#          This program is free software: you can redistribute it and/or modify
+#          it under the terms of the GNU General Public License as published by
+#          the Free Software Foundation, either version 3 of the License, or
+#          (at your option) any later version.
+#
+#          This program is distributed in the hope that it will be useful,
+#          but WITHOUT ANY WARRANTY; without even the implied warranty of
+#          MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#          GNU General Public License for more details.
+#
+#          You should have received a copy of the GNU General Public License
+#          along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+
+import os
+import shutil
+import tempfile
+
+import prefs.parameters
+
+import utils.file_manager
+
+
+def default_scratch_directory() -> str:
+    """Return the RAM disk of the system, or its default temporary directory if there is none."""
+
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK | os.X_OK):
+        return "/dev/shm"
+
+    return tempfile.gettempdir()
+
+
+class Workspace:
+    """Manage the run directories of the simulations on a RAM disk, so that their result files never touch the disk."""
+
+    def __init__(self, scratch_directory=prefs.parameters.parameters["SCRATCH_DIRECTORY"],
+                 output_directory="../database/sim/runs/", keep=prefs.parameters.parameters["KEEP_OUTPUTS"]) -> None:
+        """
+        ----------------
+        Input Parameters
+        ----------------
+
+        scratch_directory: str
+            The directory, inside which the run directories are created. If None, the RAM disk of the system is used.
+
+        output_directory: str
+            The persistent directory, to which the requested result files are copied back.
+
+        keep: tuple
+            The names of the result files, which are copied back from each run directory before it is deleted.
+        """
+
+        self.scratch_directory = scratch_directory if scratch_directory is not None else default_scratch_directory()
+        self.output_directory = output_directory
+        self.keep = tuple(keep)
+
+        # NOTE - The run directories of each workspace are grouped under a common root directory, so that they can all
+        #  be deleted at once, even if some of them have been left behind.
+        self.root = None
+
+    def __getstate__(self):
+        # The root directory belongs to the process which created it.
+        state = self.__dict__.copy()
+        state["root"] = None
+
+        return state
+
+    def create(self) -> str:
+        """Create a new and unique run directory and return its path."""
+
+        if self.root is None:
+            utils.file_manager.create_directories(self.scratch_directory)
+            self.root = tempfile.mkdtemp(prefix="adapt_", dir=self.scratch_directory)
+
+        return tempfile.mkdtemp(prefix="run_", dir=self.root)
+
+    def release(self, run_directory: str, failed=False) -> None:
+        """Copy the requested result files of a run directory back to the persistent directory and then delete it."""
+
+        destination = os.path.join(self.output_directory, os.path.basename(run_directory))
+
+        if failed:
+            # The whole run directory is kept, so that the errors of the simulation can be inspected.
+            utils.file_manager.move_file(run_directory, destination)
+            return
+
+        for filename in self.keep:
+            filepath = os.path.join(run_directory, filename)
+            if os.path.isfile(filepath):
+                utils.file_manager.create_directories(destination)
+                shutil.copy(filepath, destination)
+
+        utils.file_manager.delete_directory(run_directory)
+
+    def cleanup(self) -> None:
+        """Delete all the run directories of this workspace."""
+
+        if self.root is not None:
+            utils.file_manager.delete_directory(self.root)
+            self.root = None